@@ -0,0 +1,97 @@
+"""
+Последовательный и конвейерный режимы: кадры в секунду без ограничения FPS
+и проверка детерминизма — при одинаковом вводе оба режима должны дать
+одинаковые последние кадры.
+
+    python benchmarks/pipeline.py --frames 1000 --render-scale 1 0.5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from src import constants, levels, protocol, sprite_groups  # noqa: E402
+from src.game import Game  # noqa: E402
+from src.rendering import RenderTarget  # noqa: E402
+
+INPUTS = (0, protocol.INPUT_LEFT, protocol.INPUT_RIGHT, protocol.INPUT_RIGHT | protocol.INPUT_JUMP)
+
+
+def run(window, scale, pipelined, frames, seed):
+    rng = random.Random(seed)
+    mask = 0
+
+    with sprite_groups.World():
+        game = Game(window, render_target=RenderTarget(window, constants.WORLD_SIZE, scale), pipelined=pipelined)
+        game.add_level(levels.FirstLevel(game))
+        game.add_level(levels.SecondLevel(game))
+        game.next_level()
+        started_at = time.perf_counter()
+
+        for frame in range(frames):
+            if not game.player.alive:
+                game.start_level()
+
+            if frame % 20 == 0:
+                mask = rng.choice(INPUTS)
+
+            game.player.on_actions(protocol.mask_actions(mask), frame % 20 == 0 and bool(mask & protocol.INPUT_JUMP))
+            game.update()
+
+            if game.pipeline is not None:
+                game.pipeline.submit(game.snapshot())
+            else:
+                game.draw()
+                pygame.display.flip()
+
+        if game.pipeline is not None:
+            game.pipeline.flush()
+
+        elapsed = time.perf_counter() - started_at
+        game.pipelined = False
+        last_frame = pygame.image.tostring(window, "RGB")
+        game.current_level.kill()
+        game.player.kill()
+
+    return frames / elapsed, last_frame
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--render-scale", type=float, nargs="+", default=[1, 0.5])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    window = pygame.display.set_mode(constants.WORLD_SIZE)
+    failed = False
+
+    print(f"{'scale':>6} {'sequential fps':>15} {'pipelined fps':>14} {'speedup':>8} {'same frame':>11}")
+
+    for scale in args.render_scale:
+        sequential_fps, sequential_frame = run(window, scale, False, args.frames, args.seed)
+        pipelined_fps, pipelined_frame = run(window, scale, True, args.frames, args.seed)
+        same_frame = sequential_frame == pipelined_frame
+        failed = failed or not same_frame
+        print(
+            f"{scale:>6} {sequential_fps:15.1f} {pipelined_fps:14.1f} "
+            f"{pipelined_fps / sequential_fps:8.2f} {str(same_frame):>11}"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
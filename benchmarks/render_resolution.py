@@ -0,0 +1,124 @@
+"""
+Время кадра при разном внутреннем разрешении: мир рисуется в буфер
+world_size * scale и масштабируется в окно. Запускается в headless-режиме.
+Отдельно выводит время отрисовки мира (world ms) и масштабирования в окно
+(present ms) и проверяет, что меньший масштаб рисует мир быстрее.
+С --layers дополнительно выводит число blit'ов и время по слоям.
+
+    python benchmarks/render_resolution.py --scales 1 0.75 0.5 --frames 600 --window 1800x1200 --smooth --layers
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from src import constants, levels, sprite_groups  # noqa: E402
+from src.game import Game  # noqa: E402
+from src.rendering import WORLD_LAYERS, RenderLayer, RenderTarget  # noqa: E402
+
+
+def window_size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+def run(window, scale, smooth, frames):
+    draw_times = []
+    world_times = []
+    present_times = []
+    flip_times = []
+    layer_blits = [0] * len(RenderLayer)
+    layer_times = [0.0] * len(RenderLayer)
+
+    with sprite_groups.World():
+        render_target = RenderTarget(window, constants.WORLD_SIZE, scale, smooth)
+        game = Game(window, render_target=render_target)
+        game.add_level(levels.FirstLevel(game))
+        game.add_level(levels.SecondLevel(game))
+        game.next_level()
+
+        for _ in range(frames):
+            if not game.player.alive:
+                game.start_level()
+
+            game.update()
+            started_at = time.perf_counter()
+            game.draw()
+            drawn_at = time.perf_counter()
+            pygame.display.flip()
+            draw_times.append((drawn_at - started_at) * 1000)
+            flip_times.append((time.perf_counter() - drawn_at) * 1000)
+
+            world_times.append(sum(render_target.layer_times[layer.value] for layer in WORLD_LAYERS))
+            present_times.append(render_target.present_time)
+
+            for layer in RenderLayer:
+                layer_blits[layer.value] += render_target.layer_blits[layer.value]
+                layer_times[layer.value] += render_target.layer_times[layer.value]
+
+        game.current_level.kill()
+        game.player.kill()
+
+    layers = {
+        layer.name: (layer_blits[layer.value] / frames, layer_times[layer.value] / frames) for layer in RenderLayer
+    }
+    return render_target.size, draw_times, world_times, present_times, flip_times, layers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=float, nargs="+", default=[1, 0.75, 0.5])
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--window", type=window_size, default=constants.WORLD_SIZE, help="window size, e.g. 1920x1280")
+    parser.add_argument("--smooth", action="store_true", help="also measure smoothscale presentation")
+    parser.add_argument("--layers", action="store_true", help="print blits and time per render layer")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    window = pygame.display.set_mode(args.window)
+
+    print(
+        f"{'scale':>6} {'filter':>7} {'render size':>12} {'draw ms':>8} {'p95 ms':>8} "
+        f"{'world ms':>8} {'present ms':>10} {'flip ms':>8}"
+    )
+
+    for smooth in (False, True) if args.smooth else (False,):
+        world_medians = []
+
+        for scale in sorted(args.scales, reverse=True):
+            size, draw_times, world_times, present_times, flip_times, layers = run(window, scale, smooth, args.frames)
+            draw_times.sort()
+            world_medians.append((scale, statistics.median(world_times)))
+            print(
+                f"{scale:>6} {'smooth' if smooth else 'nearest':>7} {f'{size[0]}x{size[1]}':>12} "
+                f"{statistics.median(draw_times):8.2f} {draw_times[int(len(draw_times) * 0.95)]:8.2f} "
+                f"{world_medians[-1][1]:8.3f} {statistics.median(present_times):10.3f} "
+                f"{statistics.median(flip_times):8.2f}"
+            )
+
+            if args.layers:
+                for name, (blits, layer_time) in layers.items():
+                    print(f"{'':>6} {name:>20} {blits:8.1f} blits {layer_time:8.3f} ms")
+
+        # Presenting is bound by the window size and the scale factor, the internal resolution only
+        # decides how much the world costs
+        (largest, largest_time), *lower_scales = world_medians
+
+        for scale, world_time in lower_scales:
+            assert world_time < largest_time, (
+                f"world at scale {scale} took {world_time:.3f} ms, at {largest}: {largest_time:.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Нагрузочный тест headless-сервера на localhost: N сессий, по одному
+клиенту-водителю на каждую. Выводит тики сервера в секунду и трафик на клиента.
+
+    python benchmarks/server_load.py --sessions 1 2 4 8 --duration 5
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import protocol  # noqa: E402
+from src.server import Server  # noqa: E402
+
+INPUTS = (0, protocol.INPUT_LEFT, protocol.INPUT_RIGHT, protocol.INPUT_RIGHT | protocol.INPUT_JUMP)
+
+
+async def run_client(port, session, received):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(protocol.message(protocol.JOIN, protocol.JOIN_BODY.pack(session, 1)))
+    states = protocol.StateBuffer()
+    buffer = bytearray()
+
+    try:
+        await read_states(reader, writer, states, buffer, session, received)
+    finally:
+        writer.close()
+
+
+async def read_states(reader, writer, states, buffer, session, received):
+    jump_presses = 0
+
+    while True:
+        data = await reader.read(65536)
+
+        if not data:
+            break
+
+        received[session] += len(data)
+        buffer.extend(data)
+        acked_tick = None
+
+        for message_type, body in protocol.read_messages(buffer):
+            if message_type == protocol.STATE:
+                acked_tick = states.apply(body) or acked_tick
+
+        if acked_tick is not None:
+            writer.write(protocol.message(protocol.ACK, protocol.ACK_BODY.pack(acked_tick)))
+
+            if random.random() < 0.05:
+                mask = random.choice(INPUTS)
+                jump_presses += bool(mask & protocol.INPUT_JUMP)
+                writer.write(protocol.message(protocol.INPUT, protocol.INPUT_BODY.pack(mask, jump_presses & 0xFFFF)))
+
+
+async def measure(sessions, tick_rate, duration, port):
+    server = Server(sessions, tick_rate)
+    tcp_server = await asyncio.start_server(server.handle_client, "127.0.0.1", port)
+    received = [0] * sessions
+    clients = [asyncio.create_task(run_client(port, session, received)) for session in range(sessions)]
+    await asyncio.sleep(0.5)
+    runner = asyncio.create_task(server.run())
+    await asyncio.sleep(duration)
+    stats = server.stats
+
+    runner.cancel()
+
+    for client in clients:
+        client.cancel()
+
+    await asyncio.gather(runner, *clients, return_exceptions=True)
+    await asyncio.sleep(0.1)
+    tcp_server.close()
+    await tcp_server.wait_closed()
+    stats["received_bytes_per_client_per_second"] = sum(received) / sessions / duration
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--tick-rate", type=int, default=0, help="0 runs ticks back to back")
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--port", type=int, default=7788)
+    args = parser.parse_args()
+
+    print(f"{'sessions':>8} {'ticks/s':>10} {'session ticks/s':>16} {'KiB/s per client':>17}")
+
+    for sessions in args.sessions:
+        stats = asyncio.run(measure(sessions, args.tick_rate, args.duration, args.port))
+        print(
+            f"{sessions:>8} {stats['ticks_per_second']:>10.1f} {stats['ticks_per_second'] * sessions:>16.1f} "
+            f"{stats['bytes_per_client_per_second'] / 1024:>17.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
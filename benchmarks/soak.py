@@ -0,0 +1,175 @@
+"""
+Долгий прогон без окна: уровни, смерти и перезапуски тысячи раз подряд.
+После каждого цикла считает память (tracemalloc), живые pygame.Surface,
+игровые объекты по типам и размеры глобальных групп. Завершается с кодом 1,
+если счётчики не выходят на постоянный уровень.
+
+    python benchmarks/soak.py --cycles 2000 --sample-every 100 --output soak.jsonl
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from collections import Counter
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+
+from src import constants, game_objects, levels, protocol, sprite_groups  # noqa: E402
+from src.game import Game  # noqa: E402
+
+INPUTS = (0, protocol.INPUT_LEFT, protocol.INPUT_RIGHT, protocol.INPUT_LEFT | protocol.INPUT_JUMP,
+          protocol.INPUT_RIGHT | protocol.INPUT_JUMP)
+GROUP_NAMES = ("X_BORDERS", "Y_BORDERS", "CHARACTERS", "PLAYERS", "SOLID")
+
+
+def play(game, ticks, rng):
+    player = game.player
+    mask = 0
+
+    for tick in range(ticks):
+        if not player.alive:
+            break
+
+        if tick % 15 == 0:
+            mask = rng.choice(INPUTS)
+
+        player.on_actions(protocol.mask_actions(mask), tick % 15 == 0 and bool(mask & protocol.INPUT_JUMP))
+        game.update()
+
+    # One frame per play is enough to exercise the render caches
+    game.draw()
+
+
+def run_cycle(game, ticks, rng):
+    # One cycle visits every level: play, die, reset, play again, move on
+    for _ in game.levels:
+        play(game, ticks, rng)
+        game.player.kill()
+        game.start_level()
+        play(game, ticks, rng)
+        game.next_level()
+
+
+def live_surfaces():
+    # Surfaces are not tracked by gc, so look for them among the referents of tracked objects
+    seen = set()
+
+    for referent in gc.get_referents(*gc.get_objects()):
+        if isinstance(referent, pygame.Surface):
+            seen.add(id(referent))
+
+    return len(seen)
+
+
+def traced_memory():
+    # The harness keeps its own samples, leave them out of the game's memory
+    snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, __file__)])
+    return sum(stat.size for stat in snapshot.statistics("filename"))
+
+
+def sample(cycle, started_at):
+    gc.collect()
+    tracing = tracemalloc.is_tracing()
+    current = traced_memory() if tracing else 0
+    peak = tracemalloc.get_traced_memory()[1] if tracing else 0
+    objects = Counter(type(obj).__name__ for obj in gc.get_objects() if isinstance(obj, game_objects.GameObject))
+
+    return {
+        "cycle": cycle,
+        "time": time.perf_counter() - started_at,
+        "memory": current,
+        "memory_peak": peak,
+        "surfaces": live_surfaces(),
+        "objects": dict(sorted(objects.items())),
+        "groups": {name: len(getattr(sprite_groups, name)) for name in GROUP_NAMES},
+    }
+
+
+def counts(result):
+    return {"surfaces": result["surfaces"], **result["objects"], **result["groups"]}
+
+
+def check_steady(samples, warmup, memory_tolerance):
+    # Counts after the warmup must not grow, and memory must stay within the tolerance
+    baseline = samples[min(warmup, len(samples) - 1)]
+    errors = []
+
+    for result in samples[warmup + 1:]:
+        for name, value in counts(result).items():
+            if value > counts(baseline).get(name, 0):
+                errors.append(f"cycle {result['cycle']}: {name} grew from {counts(baseline).get(name, 0)} to {value}")
+
+        if result["memory"] - baseline["memory"] > memory_tolerance:
+            errors.append(
+                f"cycle {result['cycle']}: memory grew by {(result['memory'] - baseline['memory']) / 1024:.1f} KiB")
+
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=2000)
+    parser.add_argument("--ticks", type=int, default=30, help="ticks played between deaths and resets")
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=2, help="samples to skip before the baseline")
+    parser.add_argument("--memory-tolerance", type=float, default=256, help="KiB of growth allowed after warmup")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-tracemalloc", action="store_true", help="only track counts, several times faster")
+    parser.add_argument("--output", type=Path, help="write the series as JSON lines")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    rng = random.Random(args.seed)
+    game = Game(pygame.Surface(constants.WORLD_SIZE))
+    game.add_level(levels.FirstLevel(game))
+    game.add_level(levels.SecondLevel(game))
+    game.next_level()
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    started_at = time.perf_counter()
+    samples = [sample(0, started_at)]
+
+    for cycle in range(1, args.cycles + 1):
+        run_cycle(game, args.ticks, rng)
+
+        if cycle % args.sample_every == 0 or cycle == args.cycles:
+            samples.append(sample(cycle, started_at))
+            result = samples[-1]
+            print(
+                f"cycle {cycle:6} {result['time']:7.1f}s memory {result['memory'] / 1024:9.1f} KiB "
+                f"surfaces {result['surfaces']:5} objects {sum(result['objects'].values()):5} "
+                f"groups {sum(result['groups'].values()):5}",
+                flush=True
+            )
+
+    if args.output is not None:
+        with args.output.open("w") as file:
+            for result in samples:
+                file.write(json.dumps(result) + "\n")
+
+    errors = check_steady(samples, args.warmup, args.memory_tolerance * 1024)
+
+    for error in errors:
+        print(error)
+
+    if errors:
+        sys.exit(1)
+
+    print("steady state reached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Время до первого кадра: запускает `python -X importtime -m src --frames 1`
+в headless-режиме и выводит время запуска и самые медленные импорты.
+
+    python benchmarks/startup.py --runs 5 --output startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).resolve().parent.parent
+
+
+def parse_importtime(stderr):
+    imports = []
+
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        imports.append((int(cumulative_us), depth, name.strip()))
+
+    return imports
+
+
+def run_once():
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src", "--frames", "1"],
+        cwd=ROOT_PATH, env=env, capture_output=True, text=True, check=True
+    )
+    first_frame = time.perf_counter() - start
+    return first_frame, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="append the result as a JSON line")
+    args = parser.parse_args()
+
+    first_frame_times = []
+    import_times = []
+    imports = []
+
+    for _ in range(args.runs):
+        first_frame, imports = run_once()
+        first_frame_times.append(first_frame)
+        import_times.append(sum(cumulative for cumulative, depth, _ in imports if depth == 1) / 1e6)
+
+    result = {
+        "time": time.time(),
+        "runs": args.runs,
+        "first_frame_median": statistics.median(first_frame_times),
+        "first_frame_min": min(first_frame_times),
+        "import_time_median": statistics.median(import_times),
+        "slowest_imports": [
+            {"module": name, "cumulative": cumulative / 1e6}
+            for cumulative, _, name in sorted(imports, reverse=True)[:args.top]
+        ],
+    }
+
+    print(f"time to first frame: {result['first_frame_median'] * 1000:.1f} ms (median of {args.runs})")
+    print(f"top-level imports:   {result['import_time_median'] * 1000:.1f} ms")
+
+    for item in result["slowest_imports"]:
+        print(f"  {item['cumulative'] * 1000:8.1f} ms  {item['module']}")
+
+    if args.output is not None:
+        with args.output.open("a") as file:
+            file.write(json.dumps(result) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,5 +6,3 @@ __copyright__ = "Copyright 2021 TrixiS"
 __version__ = "1.0.0"
 
 __path__ = __import__("pkgutil").extend_path(__path__, __name__)
-
-from . import *
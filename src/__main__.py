@@ -1,15 +1,47 @@
+import argparse
 import pygame
 
 from . import levels, constants, utils
 from .game import Game
+from .rendering import RenderTarget
+from .scheduler import FrameScheduler, FramePrecision
+from .telemetry import TelemetryRecorder
 
-pygame.init()
+
+def window_size(value):
+    width, height = value.lower().split("x")
+    return int(width), int(height)
+
+
+parser = argparse.ArgumentParser(prog="python -m src")
+parser.add_argument("--fps", type=int, default=constants.GAME_FPS, help="target frames per second")
+parser.add_argument("--unlocked", action="store_true", help="do not limit the frame rate (benchmarking)")
+parser.add_argument("--busy-loop", action="store_true", help="use tick_busy_loop for precise frame pacing")
+parser.add_argument("--skip-frames", action="store_true", help="skip rendering frames that missed the deadline")
+parser.add_argument("--adaptive-quality", action="store_true", help="lower render quality while over budget")
+parser.add_argument("--frames", type=int, help="exit after this many game frames (benchmarking)")
+parser.add_argument("--telemetry", help="record per-tick telemetry into this ring buffer file")
+parser.add_argument("--window", type=window_size, default=constants.WORLD_SIZE, help="window size, e.g. 1920x1280")
+parser.add_argument("--render-scale", type=float, default=1.0, help="internal resolution relative to the world")
+parser.add_argument("--smooth", action="store_true", help="present the frame with smoothscale")
+parser.add_argument("--pipelined", action="store_true", help="render on a separate thread, one frame behind")
+args = parser.parse_args()
+
+pygame.display.init()
 pygame.font.init()
 pygame.display.set_caption(constants.WINDOW_TITLE)
 pygame.display.set_icon(utils.load_image("../icon.png"))
-screen = pygame.display.set_mode((1200, 800))
+screen = pygame.display.set_mode(args.window)
 
-game = Game(screen)
+scheduler = FrameScheduler(
+    None if args.unlocked else args.fps,
+    FramePrecision.busy if args.busy_loop else FramePrecision.sleep,
+    skip_frames=args.skip_frames,
+    adapt_quality=args.adaptive_quality
+)
+telemetry = TelemetryRecorder(args.telemetry) if args.telemetry else None
+render_target = RenderTarget(screen, constants.WORLD_SIZE, args.render_scale, args.smooth)
+game = Game(screen, scheduler, telemetry, render_target, args.pipelined)
 game.add_level(levels.FirstLevel(game))
 game.add_level(levels.SecondLevel(game))
-game.start_game()
+game.start_game(args.frames)
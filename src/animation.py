@@ -0,0 +1,116 @@
+import json
+import pygame
+
+from functools import lru_cache
+
+from . import utils
+
+
+def _frame_sort_key(path):
+    return (0, int(path.stem), "") if path.stem.isdigit() else (1, 0, path.stem)
+
+
+class AnimationState:
+
+    def __init__(self, name, frame_ids, durations, loop=True, next_state=None):
+        if isinstance(durations, int):
+            durations = [durations] * len(frame_ids)
+
+        self.name = name
+        self.loop = loop
+        self.next_state = next_state
+        self.transitions = []
+        self.timeline = tuple(
+            frame_id
+            for frame_id, duration in zip(frame_ids, durations)
+            for _ in range(duration)
+        )
+
+
+class AnimationStateMachine:
+
+    def __init__(self, name, data):
+        images = []
+        frame_dirs = {}
+        self.name = name
+        self.states = {}
+
+        for state_name, state_data in data["states"].items():
+            frames = state_data["frames"]
+
+            if frames not in frame_dirs:
+                paths = sorted(
+                    (path for path in (utils.ASSETS_PATH / "sprites" / name / frames).glob("*.png") if path.is_file()),
+                    key=_frame_sort_key
+                )
+                frame_dirs[frames] = list(range(len(images), len(images) + len(paths)))
+                images.extend(utils.load_image_from_path(path) for path in paths)
+
+            self.states[state_name] = AnimationState(
+                state_name,
+                frame_dirs[frames],
+                state_data["durations"],
+                state_data.get("loop", True),
+                state_data.get("next")
+            )
+
+        for transition in data.get("transitions", []):
+            target = self.states[transition["to"]]
+
+            for source in transition["from"]:
+                self.states[source].transitions.append((target, transition["when"]))
+
+        self.initial = self.states[data["initial"]]
+        self.flipped_offset = len(images)
+        self.images = images + [pygame.transform.flip(image, True, False) for image in images]
+
+
+@lru_cache(maxsize=None)
+def _load_data():
+    with (utils.ASSETS_PATH / "animations.json").open(encoding="utf-8") as file:
+        return json.load(file)
+
+
+@lru_cache(maxsize=None)
+def load_machine(name):
+    return AnimationStateMachine(name, _load_data()[name])
+
+
+class Animator:
+
+    def __init__(self, machine):
+        self.machine = machine
+        self.state = machine.initial
+        self.elapsed = 0
+        self.frame = self.state.timeline[0]
+
+    def set_state(self, state):
+        self.state = state
+        self.elapsed = 0
+
+    def update(self, owner):
+        state = self.state
+
+        if not state.loop and self.elapsed >= len(state.timeline):
+            owner.on_animation_end(state.name)
+            self.set_state(self.machine.states[state.next_state])
+
+        for target, condition in self.state.transitions:
+            if getattr(owner, condition):
+                self.set_state(target)
+                break
+
+        timeline = self.state.timeline
+
+        if self.state.loop:
+            self.frame = timeline[self.elapsed % len(timeline)]
+        else:
+            self.frame = timeline[min(self.elapsed, len(timeline) - 1)]
+
+        self.elapsed += 1
+
+    def frame_id(self, flipped=False):
+        return self.frame + self.machine.flipped_offset if flipped else self.frame
+
+    def image(self, flipped=False):
+        return self.machine.images[self.frame_id(flipped)]
@@ -0,0 +1,114 @@
+import argparse
+import socket
+import pygame
+
+from . import constants, game_objects, protocol, utils
+from .controls import Action, Controls
+from .rendering import RenderQueue
+
+
+class RemoteClient:
+
+    def __init__(self, host=constants.SERVER_HOST, port=constants.SERVER_PORT, session=0, driver=True):
+        self.socket = socket.create_connection((host, port))
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.setblocking(False)
+        self.buffer = bytearray()
+        self.states = protocol.StateBuffer()
+        self.driver = driver
+        self.size = None
+        self.bytes_received = 0
+        self.socket.sendall(protocol.message(protocol.JOIN, protocol.JOIN_BODY.pack(session, driver)))
+
+    def receive(self):
+        while True:
+            try:
+                data = self.socket.recv(65536)
+            except BlockingIOError:
+                break
+
+            if not data:
+                raise ConnectionError("server closed the connection")
+
+            self.bytes_received += len(data)
+            self.buffer.extend(data)
+
+        acked_tick = None
+
+        for message_type, body in protocol.read_messages(self.buffer):
+            if message_type == protocol.WELCOME:
+                _, *self.size = protocol.WELCOME_BODY.unpack(body)
+            elif message_type == protocol.STATE:
+                acked_tick = self.states.apply(body) or acked_tick
+
+        if acked_tick is not None:
+            self.socket.sendall(protocol.message(protocol.ACK, protocol.ACK_BODY.pack(acked_tick)))
+
+    def send_input(self, mask, jump_presses):
+        if self.driver:
+            self.socket.sendall(protocol.message(protocol.INPUT, protocol.INPUT_BODY.pack(mask, jump_presses & 0xFFFF)))
+
+    def close(self):
+        self.socket.close()
+
+
+def draw_state(screen, state, frame_images):
+    queue = RenderQueue()
+
+    for _, (type_id, x, y, _, frame_id) in sorted(state.items()):
+        queue.add(game_objects.OBJECT_TYPES[type_id].RENDER_LAYER, frame_images[type_id][frame_id], (x, y))
+
+    for items in queue.layers:
+        screen.blits(items, False)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.client")
+    parser.add_argument("--host", default=constants.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=constants.SERVER_PORT)
+    parser.add_argument("--session", type=int, default=0)
+    parser.add_argument("--spectate", action="store_true", help="watch the session without driving it")
+    args = parser.parse_args()
+
+    client = RemoteClient(args.host, args.port, args.session, not args.spectate)
+    pygame.display.init()
+    pygame.display.set_caption(constants.WINDOW_TITLE)
+    pygame.display.set_icon(utils.load_image("../icon.png"))
+
+    while client.size is None:
+        client.receive()
+        pygame.time.wait(10)
+
+    screen = pygame.display.set_mode(client.size)
+    frame_images = [object_type.frame_images() for object_type in game_objects.OBJECT_TYPES]
+    clock = pygame.time.Clock()
+    controls = Controls()
+    previous_input = None
+
+    try:
+        while True:
+            clock.tick(constants.GAME_FPS)
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return
+
+                controls.process_event(event)
+
+            # A tap that goes down and up within one frame never shows as held, the counter still moves
+            player_input = (protocol.input_mask(controls.held), controls.press_counts[Action.jump])
+
+            if player_input != previous_input:
+                client.send_input(*player_input)
+                previous_input = player_input
+
+            client.receive()
+            screen.fill((0, 0, 0))
+            draw_state(screen, client.states.state, frame_images)
+            pygame.display.flip()
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
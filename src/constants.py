@@ -1,6 +1,14 @@
 TILE_SIZE: int = 40
+WORLD_SIZE: tuple = (1200, 800)
 ENEMY_DAMAGE: float = 25
 GAME_FPS: int = 60
+PAUSE_WAIT_TIMEOUT: int = 100
+FRAME_STATS_WINDOW: int = 120
+MAX_SKIPPED_FRAMES: int = 2
+QUALITY_DROP_MISSES: int = 10
+QUALITY_RESTORE_FRAMES: int = 120
+INPUT_GRACE_TIME: int = 100
+DEBUG_OVERLAY_REFRESH: int = 30
 
 WIN_TEXT: str = "!!! Победа !!!"
 RETURN_TO_GAME: str = "Вернуться в игру"
@@ -11,3 +19,15 @@ WINDOW_TITLE: str = "Elegiggle"
 GREEN_COLOR: tuple = (47, 87, 47, 150)
 ORANGE_COLOR: tuple = (100, 70, 28, 150)
 RED_COLOR: tuple = (100, 41, 38, 150)
+WHITE_COLOR: tuple = (255, 255, 255)
+BOSS_HEALTH_BACKGROUND: tuple = (0, 0, 0, 100)
+
+TEXT_CACHE_SIZE: int = 64
+HEALTH_BAR_CACHE_SIZE: int = 128
+
+SERVER_HOST: str = "127.0.0.1"
+SERVER_PORT: int = 7777
+STATE_HISTORY_TICKS: int = 64
+MAX_CLIENT_WRITE_BUFFER: int = 256 * 1024
+
+TELEMETRY_CAPACITY: int = 1 << 18
@@ -0,0 +1,131 @@
+import time
+import pygame
+
+from collections import deque
+from enum import Enum
+
+from . import constants
+
+
+class Action(Enum):
+
+    left = 0
+    right = 1
+    jump = 2
+    debug = 3
+
+
+DEFAULT_BINDINGS = {
+    pygame.K_a: Action.left,
+    pygame.K_d: Action.right,
+    pygame.K_SPACE: Action.jump,
+    pygame.K_F3: Action.debug,
+}
+
+# Presses whose effect shows up in the world, the latency of these is measured
+MEASURED_ACTIONS = (Action.left, Action.right, Action.jump)
+
+
+def now():
+    return time.perf_counter() * 1000
+
+
+class Controls:
+
+    # Maps key events to actions through a rebindable table. Every press is stamped when
+    # its event is pumped, and the stamp follows it to the flip that first shows its effect.
+    # The frame scheduler pumps while it waits, so most presses are stamped on arrival; one
+    # that queued while a frame was working gets the previous pump time, which makes its
+    # latency an upper bound, too high by at most that frame's work time
+
+    def __init__(self, bindings=None, grace_time=constants.INPUT_GRACE_TIME):
+        self.bindings = dict(DEFAULT_BINDINGS if bindings is None else bindings)
+        self.grace_time = grace_time
+        self.held = set()
+        self.pressed = {}
+        # Presses seen so far per action, a remote peer picks up taps that never show as held
+        self.press_counts = dict.fromkeys(Action, 0)
+        self.applied = []
+        self.latencies = {action: deque(maxlen=constants.FRAME_STATS_WINDOW) for action in MEASURED_ACTIONS}
+
+    def bind(self, key, action):
+        self.bindings[key] = action
+
+    def unbind(self, key):
+        self.bindings.pop(key, None)
+
+    def reset(self):
+        self.held.clear()
+        self.pressed.clear()
+        self.applied.clear()
+
+    def sync(self, keys):
+        # Picks up keys that are already down, e.g. after the pause menu swallowed their events
+        self.held = {action for key, action in self.bindings.items() if keys[key]}
+
+    def process_event(self, event, timestamp=None):
+        action = self.bindings.get(getattr(event, "key", None))
+
+        if action is None:
+            return False
+
+        if event.type == pygame.KEYDOWN:
+            self.held.add(action)
+            self.press(action, timestamp)
+        elif event.type == pygame.KEYUP:
+            self.held.discard(action)
+
+        return True
+
+    def press(self, action, timestamp=None):
+        self.pressed[action] = now() if timestamp is None else timestamp
+        self.press_counts[action] += 1
+
+    def consume(self, action):
+        return self.pressed.pop(action, None) is not None
+
+    def apply(self, player, timestamp=None):
+        # A jump press waits up to the grace time for the player to land and take it
+        timestamp = now() if timestamp is None else timestamp
+        jump_pressed_at = self.pressed.get(Action.jump)
+
+        if jump_pressed_at is not None and timestamp - jump_pressed_at > self.grace_time:
+            del self.pressed[Action.jump]
+            jump_pressed_at = None
+
+        jumped = player.on_actions(self.held, jump_pressed_at is not None)
+
+        for action in MEASURED_ACTIONS:
+            if action == Action.jump and not jumped:
+                continue
+
+            pressed_at = self.pressed.pop(action, None)
+
+            if pressed_at is not None:
+                self.applied.append((action, pressed_at))
+
+    def take_applied(self):
+        applied, self.applied = self.applied, []
+        return applied
+
+    def presented(self, applied, timestamp=None):
+        # Called once the frame carrying these applied presses is flipped, possibly from the render thread
+        timestamp = now() if timestamp is None else timestamp
+
+        for action, pressed_at in applied:
+            self.latencies[action].append(timestamp - pressed_at)
+
+    @property
+    def stats(self):
+        # Press to flip, in milliseconds; see the class comment for how presses are stamped
+        stats = {}
+
+        for action, latencies in self.latencies.items():
+            latencies = list(latencies)
+            stats[action.name] = {
+                "count": len(latencies),
+                "average": sum(latencies) / len(latencies) if latencies else 0,
+                "max": max(latencies, default=0),
+            }
+
+        return stats
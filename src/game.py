@@ -1,8 +1,14 @@
 import sys
+import time
 import pygame
 
 from . import game_objects, sprite_groups, constants
-from .game_menu import GameMenu
+from .controls import Action, Controls
+from .hud import Hud
+from .pipeline import RenderPipeline
+from .rendering import RenderLayer, RenderQueue, RenderSnapshot, RenderTarget
+from .scheduler import FrameScheduler
+from .utils import cached_property
 
 
 class CycledList(list):
@@ -23,22 +29,49 @@ class CycledList(list):
 
 class Game:
 
-    def __init__(self, screen):
+    def __init__(self, screen, scheduler=None, telemetry=None, render_target=None, pipelined=False):
         self.levels = CycledList()
         self.screen = screen
-        self.width, self.height = screen.get_size()
+        self.render_target = render_target or RenderTarget(screen, screen.get_size())
+        self.width, self.height = self.render_target.world_size
         self.x_tiles = self.width // constants.TILE_SIZE
         self.y_tiles = self.height // constants.TILE_SIZE
-        self.menu = GameMenu(self)
+        self.hud = Hud(self)
         self.is_paused = False
+        self.pause_background = None
+        self.menu_ui_state = None
         self.current_level = None
-        self.clock = pygame.time.Clock()
+        self.scheduler = scheduler or FrameScheduler()
+        self.telemetry = telemetry
+        self.frame_timings = [0.0] * 4
+        self.controls = Controls()
+        self.pipeline = None
+        self.pipelined = pipelined
         self.player = None
         self.left_border = game_objects.Border(0, 0, 0, self.height)
         self.right_border = game_objects.Border(self.width, 0, self.width, self.height)
         self.up_border = game_objects.Border(0, 0, self.width, 0)
         self.down_border = game_objects.Border(0, self.height, self.width, self.height)
 
+    @property
+    def pipelined(self):
+        return self.pipeline is not None
+
+    @pipelined.setter
+    def pipelined(self, enabled):
+        if enabled and self.pipeline is None:
+            self.pipeline = RenderPipeline(self.render_target, self.presented)
+            self.pipeline.start()
+        elif not enabled and self.pipeline is not None:
+            self.pipeline.stop()
+            self.pipeline = None
+
+    @cached_property
+    def menu(self):
+        from .game_menu import GameMenu
+
+        return GameMenu(self)
+
     def add_level(self, level):
         self.levels.append(level)
 
@@ -65,43 +98,142 @@ class Game:
 
     def toggle_pause(self):
         self.is_paused = not self.is_paused
+        self.pause_background = None
         pygame.mouse.set_visible(self.is_paused)
 
+        if self.is_paused:
+            self.controls.reset()
+        else:
+            # The menu was drawn over the window, which the render target may restore only partly
+            self.render_target.invalidate()
+            self.controls.sync(pygame.key.get_pressed())
+
     def exit_game(self):
         sys.exit()
 
-    def start_game(self):
-        self.next_level()
+    def process_event(self, event, timestamp=None):
+        if event.type == pygame.QUIT:
+            self.exit_game()
 
-        while True:
-            time_delta = self.clock.tick(constants.GAME_FPS) / 1000
-            keys = pygame.key.get_pressed()
+        if event.type == pygame.KEYUP and event.key == pygame.K_ESCAPE:
+            self.toggle_pause()
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.exit_game()
+        if self.is_paused:
+            self.menu.process_events(event)
+        else:
+            self.controls.process_event(event, timestamp)
 
-                if event.type == pygame.KEYUP and event.key == pygame.K_ESCAPE:
-                    self.toggle_pause()
+    def update(self):
+        self.current_level.update()
+        sprite_groups.PLAYERS.update()
+        self.current_level.update_triggers()
 
-                if self.is_paused:
-                    self.menu.process_events(event)
-                elif event.type in (pygame.KEYUP, pygame.KEYDOWN):
-                    self.player.on_keyboard(event=event)
+    def record_telemetry(self):
+        self.telemetry.record_tick(self.scheduler.frames, self.current_level.tracked, self.frame_timings)
 
-            if self.is_paused:
-                self.menu.update(time_delta)
-                self.menu.draw_ui(self.screen)
+    def game_frame(self):
+        timings = self.frame_timings
+        timings[:] = (0.0, 0.0, 0.0, 0.0)
+        # Events are handled while the scheduler waits for the frame, so presses are stamped on arrival
+        self.scheduler.tick(self.process_event)
+        timings[0] = self.scheduler.event_time
+
+        if self.is_paused:
+            return
+
+        if not self.player.alive:
+            self.is_paused = True
+            return
+
+        phase_at = time.perf_counter()
+
+        if self.controls.consume(Action.debug):
+            self.hud.show_debug = not self.hud.show_debug
+
+        self.controls.apply(self.player)
+        self.update()
+        started_at, phase_at = phase_at, time.perf_counter()
+        timings[1] = (phase_at - started_at) * 1000
+
+        if self.scheduler.should_render():
+            if self.pipeline is not None:
+                # Draw time is building the snapshot, flip time is how long the render thread held us up
+                snapshot = self.snapshot()
+                timings[2] = (time.perf_counter() - phase_at) * 1000
+                self.pipeline.submit(snapshot)
+                timings[3] = self.pipeline.wait_time
             else:
-                if not self.player.alive:
-                    self.is_paused = True
-                    continue
+                snapshot = self.draw()
+                started_at, phase_at = phase_at, time.perf_counter()
+                timings[2] = (phase_at - started_at) * 1000
+                pygame.display.flip()
+                self.presented(snapshot)
+                timings[3] = (time.perf_counter() - phase_at) * 1000
+
+        if self.telemetry is not None:
+            self.record_telemetry()
 
-                self.player.on_keyboard(keys=keys)
-                self.current_level.draw(self.screen)
-                self.current_level.update(self.screen)
-                sprite_groups.PLAYERS.draw(self.screen)
-                sprite_groups.PLAYERS.update(self.screen)
+    def snapshot(self):
+        detailed = not self.scheduler.reduced_quality
+        queue = RenderQueue()
+        self.current_level.queue_draw(queue, detailed)
+        queue.add_sprites(sprite_groups.PLAYERS)
+        queue.extend(RenderLayer.hud, self.hud.blits(self.screen.get_size()))
 
+        return RenderSnapshot(
+            self.scheduler.frames, (0, 0, 0) if detailed else self.current_level.background_color, queue,
+            self.controls.take_applied()
+        )
+
+    def draw(self):
+        snapshot = self.snapshot()
+        self.render_target.render(snapshot)
+        return snapshot
+
+    def presented(self, snapshot):
+        self.controls.presented(snapshot.presses)
+
+    def paused_frame(self):
+        redraw = False
+
+        if self.pause_background is None:
+            if self.pipeline is not None:
+                self.pipeline.flush()
+
+            self.pause_background = self.screen.copy()
+            redraw = True
+
+        event = pygame.event.wait(constants.PAUSE_WAIT_TIMEOUT)
+        events = [] if event.type == pygame.NOEVENT else [event, *pygame.event.get()]
+
+        for event in events:
+            self.process_event(event)
+
+            if event.type != pygame.MOUSEMOTION:
+                redraw = True
+
+        time_delta = self.scheduler.idle_tick()
+
+        if not self.is_paused:
+            return
+
+        self.menu.update(time_delta)
+        ui_state = self.menu.ui_state()
+
+        if redraw or ui_state != self.menu_ui_state:
+            self.menu_ui_state = ui_state
+            self.screen.blit(self.pause_background, (0, 0))
+            self.menu.draw_ui(self.screen)
             pygame.display.flip()
-            self.screen.fill((0, 0, 0))
+
+    def start_game(self, frames=None):
+        self.next_level()
+
+        try:
+            while frames is None or self.scheduler.frames < frames:
+                if self.is_paused:
+                    self.paused_frame()
+                else:
+                    self.game_frame()
+        finally:
+            self.pipelined = False
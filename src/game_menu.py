@@ -7,12 +7,13 @@ from . import constants
 class GameMenu(pygame_gui.UIManager):
 
     def __init__(self, game):
-        super().__init__((game.width, game.height))
+        width, height = game.screen.get_size()
+        super().__init__((width, height))
         self.game = game
         button_width = 300
         button_height = 100
-        center_x = game.width // 2
-        center_y = game.width // 2
+        center_x = width // 2
+        center_y = width // 2
 
         self.return_button = pygame_gui.elements.UIButton(
             relative_rect=pygame.Rect(
@@ -51,6 +52,12 @@ class GameMenu(pygame_gui.UIManager):
         elif event.ui_element == self.return_button:
             self.game.toggle_pause()
 
+    def ui_state(self):
+        return tuple(
+            (button.visible, button.hovered, button.held)
+            for button in (self.return_button, self.reset_level_button, self.exit_button)
+        )
+
     def draw_ui(self, window_surface: pygame.surface.Surface):
         super().draw_ui(window_surface)
 
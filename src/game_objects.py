@@ -1,11 +1,59 @@
 import pygame
-import itertools
+import math
 import abc
 
 from enum import Enum
-from cached_property import cached_property
 
-from . import sprite_groups, constants, utils, levels
+from . import animation, sprite_groups, constants, utils
+from .controls import Action
+from .navigation import EdgeKind
+from .rendering import RenderLayer
+from .triggers import TriggerZone
+from .utils import cached_property
+
+
+CONTACT_LEFT = 1
+CONTACT_RIGHT = 2
+CONTACT_UP = 4
+CONTACT_DOWN = 8
+
+
+def axis_times(start, size, delta, solid_start, solid_size):
+    # When, as fractions of the move, the body's span on one axis starts and stops
+    # overlapping the solid's; None if it never gets there
+    end = start + size
+    solid_end = solid_start + solid_size
+
+    if start < solid_end and solid_start < end:
+        if delta > 0:
+            return -math.inf, (solid_end - start) / delta
+        if delta < 0:
+            return -math.inf, (solid_start - end) / delta
+        return -math.inf, math.inf
+
+    if delta > 0 and solid_start >= end:
+        return (solid_start - end) / delta, (solid_end - start) / delta
+    if delta < 0 and solid_end <= start:
+        return (solid_end - start) / delta, (solid_start - end) / delta
+
+    return None
+
+
+def impact(rect, dx, dy, solid):
+    # (time, hit on the x axis) of the body running into solid during the move, or None.
+    # Solids it overlaps from the start don't block it, a corner hit counts as vertical
+    x_times = axis_times(rect.x, rect.w, dx, solid.x, solid.w)
+    y_times = axis_times(rect.y, rect.h, dy, solid.y, solid.h)
+
+    if x_times is None or y_times is None:
+        return None
+
+    entry = max(x_times[0], y_times[0])
+
+    if entry == -math.inf or entry > 1 or entry >= min(x_times[1], y_times[1]):
+        return None
+
+    return entry, x_times[0] > y_times[0]
 
 
 class WalkState(Enum):
@@ -32,6 +80,8 @@ class Collidable(abc.ABC):
 
 class Border(pygame.sprite.Sprite, Collidable):
 
+    STATIC = True
+
     def __init__(self, x1, y1, x2, y2):
         super().__init__(sprite_groups.SOLID)
 
@@ -45,67 +95,42 @@ class Border(pygame.sprite.Sprite, Collidable):
             self.rect = pygame.Rect(x1, y1, x2 - x1, 1)
 
 
-class Animation:
-
-    def __init__(self, images, frame_delay, cycled=True):
-        self.images = images
-        self.frame_delay = frame_delay
-        self.cycled = cycled
-        self.frames = None
-        self._frame = None
-        self.current_delay = 0
-        self.reset()
-
-    @classmethod
-    def from_dir(cls, path, *args):
-        images = [
-            utils.load_image_from_path(filepath)
-            for filepath in path.glob("*.png")
-            if filepath.is_file()
-        ]
-        return cls(images, *args)
-
-    def reset(self):
-        if self.cycled:
-            self.frames = itertools.cycle(self.images)
-        else:
-            self.frames = itertools.chain(self.images, itertools.cycle((None, )))
-
-        self._frame = next(self.frames)
-        self.current_delay = 0
-
-    @property
-    def frame(self):
-        if self.current_delay >= self.frame_delay:
-            self.current_delay = 0
-            self._frame = next(self.frames)
-        else:
-            self.current_delay += 1
-
-        return self._frame
-
-
 class GameObject(pygame.sprite.Sprite, Collidable):
 
     ADDITIONAL_GROUPS = []
     MASS = 0
+    DECORATIVE = False
+    # Never moves once the level has placed it, lets SOLID index it by position
+    STATIC = False
+    RENDER_LAYER = RenderLayer.objects
 
     __object_id = 0
 
     def __init__(self, *groups, **kwargs):
         super().__init__(*groups, *self.ADDITIONAL_GROUPS)
-        self.object_id = self.__object_id
-        self.__object_id += 1
+        self.object_id = GameObject.__object_id
+        GameObject.__object_id += 1
         self.speed = kwargs.get("speed", pygame.Vector2(0, 0))
         self.base_image = utils.load_image(kwargs.get("image", f"{self.__class__.__name__.lower()}.png"))
-        self.image = self.base_image.copy()
+        self.image = self.base_image
         self.rect = self.image.get_rect()
         self.mass = self.MASS
+        self.contacts = 0
+
+    @classmethod
+    def frame_images(cls):
+        return [utils.load_image(f"{cls.__name__.lower()}.png")]
+
+    @property
+    def frame_id(self):
+        return 0
 
     @cached_property
     def level(self):
+        from .levels import Level
+
         for group in self.groups():
-            if isinstance(group, levels.Level):
+            if isinstance(group, Level):
                 return group
 
     @property
@@ -128,38 +153,78 @@ class GameObject(pygame.sprite.Sprite, Collidable):
             if self.speed.y == 0:
                 self.speed.y = self._gravity(self.mass)
 
+    def sweep(self, dx, dy):
+        # Swept AABB: the body stops at the earliest solid it would enter on either axis and
+        # slides the rest of the way along the other one, so neither fast nor diagonal moves
+        # tunnel through solids or cut their corners. Returns the solids hit on each axis
+        rect = self.rect
+        target = rect.move(dx, dy)
+
+        if target.topleft == rect.topleft:
+            return [], []
+
+        solids = [sprite for sprite in sprite_groups.SOLID.query(rect.union(target)) if sprite is not self]
+        collided_x = []
+        collided_y = []
+
+        # The second pass is the slide, only one axis is left to move on then
+        for _ in range(2):
+            dx, dy = target.x - rect.x, target.y - rect.y
+
+            if not dx and not dy:
+                break
+
+            impacts = []
+
+            for sprite in solids:
+                hit = impact(rect, dx, dy, sprite.rect)
+
+                if hit is not None:
+                    impacts.append((*hit, sprite))
+
+            if not impacts:
+                rect = target
+                break
+
+            time = min(hit_time for hit_time, _, _ in impacts)
+            hits_x = [sprite for hit_time, on_x, sprite in impacts if hit_time == time and on_x]
+            hits_y = [sprite for hit_time, on_x, sprite in impacts if hit_time == time and not on_x]
+            rect = rect.move(round(dx * time), round(dy * time))
+
+            if hits_x:
+                if dx > 0:
+                    rect.right = hits_x[0].rect.left
+                else:
+                    rect.left = hits_x[0].rect.right
+
+                target.x = rect.x
+                collided_x += hits_x
+
+            if hits_y:
+                if dy > 0:
+                    rect.bottom = hits_y[0].rect.top
+                else:
+                    rect.top = hits_y[0].rect.bottom
+
+                target.y = rect.y
+                collided_y += hits_y
+
+        self.rect = rect
+        return collided_x, collided_y
+
     def update(self, *args, **kwargs):
         if self.speed.y == 0:
             self.speed.y = self._gravity(self.mass)
 
-        collided_left = []
-        collided_right = []
-        collided_up = []
-        collided_down = []
-
-        self.rect = self.rect.move(self.speed.x, 0)
-        for sprite in pygame.sprite.spritecollide(self, sprite_groups.SOLID, False):
-            if sprite == self:
-                continue
-
-            if self.speed.x > 0:
-                self.rect.right = sprite.rect.left
-                collided_right.append(sprite)
-            elif self.speed.x < 0:
-                self.rect.left = sprite.rect.right
-                collided_left.append(sprite)
-
-        self.rect = self.rect.move(0, self.speed.y)
-        for sprite in pygame.sprite.spritecollide(self, sprite_groups.SOLID, False):
-            if sprite == self:
-                continue
-
-            if self.speed.y > 0:
-                self.rect.bottom = sprite.rect.top
-                collided_down.append(sprite)
-            elif self.speed.y < 0:
-                self.rect.top = sprite.rect.bottom
-                collided_up.append(sprite)
+        collided_x, collided_y = self.sweep(self.speed.x, self.speed.y)
+        collided_left = collided_x if self.speed.x < 0 else []
+        collided_right = collided_x if self.speed.x > 0 else []
+        collided_up = collided_y if self.speed.y < 0 else []
+        collided_down = collided_y if self.speed.y > 0 else []
+        self.contacts = (
+            (CONTACT_LEFT if collided_left else 0) | (CONTACT_RIGHT if collided_right else 0) |
+            (CONTACT_UP if collided_up else 0) | (CONTACT_DOWN if collided_down else 0)
+        )
 
         if collided_left:
             self.collide_left(collided_left)
@@ -175,32 +240,51 @@ class GameObject(pygame.sprite.Sprite, Collidable):
 
 
 class BackgroundTile(GameObject):
-    pass
+
+    DECORATIVE = True
+    RENDER_LAYER = RenderLayer.background
 
 
 class BackgroundBrick(GameObject):
-    pass
+
+    DECORATIVE = True
+    RENDER_LAYER = RenderLayer.background
 
 
 class GroundTile(GameObject):
 
     ADDITIONAL_GROUPS = [sprite_groups.SOLID]
+    STATIC = True
+    RENDER_LAYER = RenderLayer.terrain
 
 
 class Brick(GameObject):
 
     ADDITIONAL_GROUPS = [sprite_groups.SOLID]
+    STATIC = True
+    RENDER_LAYER = RenderLayer.terrain
 
 
-class LevelPointer(GameObject):
+class TriggerObject(GameObject):
 
-    ADDITIONAL_GROUPS = [sprite_groups.SOLID]
-    MASS = 5
+    # Gameplay object outside of physics: the level settles it onto the ground once
+    # and reports actors touching it through its trigger zone
 
-    def collide_right(self, sprites):
-        super().collide_right(sprites)
+    @abc.abstractmethod
+    def trigger_zone(self):
+        raise NotImplementedError()
 
-        if self.level.player in sprites:
+    def update(self, *args, **kwargs):
+        pass
+
+
+class LevelPointer(TriggerObject):
+
+    def trigger_zone(self):
+        return TriggerZone(self.rect, on_enter=self.on_enter)
+
+    def on_enter(self, actor):
+        if actor is self.level.player:
             self.level.game.next_level()
 
 
@@ -229,6 +313,7 @@ class Box(GameObject):
 class Character(GameObject):
 
     ADDITIONAL_GROUPS = [sprite_groups.SOLID, sprite_groups.CHARACTERS]
+    RENDER_LAYER = RenderLayer.characters
 
     JUMP_SPEED = 0
     JUMP_TILES = 0
@@ -245,20 +330,32 @@ class Character(GameObject):
         self.jump_tiles = self.JUMP_TILES
         self.walk_speed = self.WALK_SPEED
         self.health = 100
-        self.walk_animat = Animation.from_dir(
-            utils.ASSETS_PATH / f"sprites/{self.__class__.__name__.lower()}/walk", 2)
-        self.idle_animat = Animation.from_dir(
-            utils.ASSETS_PATH / f"sprites/{self.__class__.__name__.lower()}/idle", 2)
-        self.hit_animat = Animation.from_dir(
-            utils.ASSETS_PATH / f"sprites/{self.__class__.__name__.lower()}/hit", 5, False)
-
-    def draw_health_bar(self, screen):
-        pass
+        self.animator = animation.Animator(animation.load_machine(self.__class__.__name__.lower()))
+
+    @classmethod
+    def frame_images(cls):
+        return animation.load_machine(cls.__name__.lower()).images
+
+    @property
+    def frame_id(self):
+        return self.animator.frame_id(not self.x_direction)
 
     @property
     def alive(self):
         return self.health > 0
 
+    @property
+    def is_walking(self):
+        return self.speed.x != 0
+
+    @property
+    def is_resting(self):
+        return self.speed.x == 0 and self.speed.y == 0
+
+    def on_animation_end(self, state):
+        if state == "hit":
+            self.is_damaged = False
+
     def kill(self):
         self.health = 0
         self.remove(sprite_groups.SOLID)
@@ -343,34 +440,18 @@ class Character(GameObject):
             self.speed.y = self._gravity(self.jump_speed)
             self.jump_tiles = self.JUMP_TILES
 
-        if self.is_damaged:
-            frame = self.hit_animat.frame
-
-            if frame is None:
-                self.is_damaged = False
-                self.hit_animat.reset()
-            else:
-                self.image = pygame.transform.flip(frame, not self.x_direction, False)
-
         if self.speed.x > 0:
-            if not self.is_damaged:
-                self.image = self.walk_animat.frame
-
             self.x_direction = True
         elif self.speed.x < 0:
-            if not self.is_damaged:
-                self.image = pygame.transform.flip(self.walk_animat.frame, True, False)
-
             self.x_direction = False
 
-        if self.speed.x == 0 and self.speed.y == 0 and not self.is_damaged:
-            self.image = pygame.transform.flip(self.idle_animat.frame, not self.x_direction, False)
-
-        self.draw_health_bar(args[0])
+        self.animator.update(self)
+        self.image = self.animator.image(not self.x_direction)
 
 
 class Player(Character):
 
+    RENDER_LAYER = RenderLayer.player
     MASS = 5
     JUMP_SPEED = 5
     JUMP_TILES = 5
@@ -378,23 +459,8 @@ class Player(Character):
 
     def __init__(self, *args,  **kwargs):
         super().__init__(*args, sprite_groups.PLAYERS, **kwargs)
-        self.idle_animat.frame_delay = 5
-        self.walk_animat.frame_delay = 3
         self.walk_state = WalkState.idle
 
-    def draw_health_bar(self, screen):
-        if self.health >= 70:
-            bar_color = constants.GREEN_COLOR
-        elif self.health >= 40:
-            bar_color = constants.ORANGE_COLOR
-        else:
-            bar_color = constants.RED_COLOR
-
-        pygame.draw.rect(
-            screen, bar_color,
-            (self.rect.x, self.rect.y - 12, self.rect.width / 100 * self.health, 4)
-        )
-
     def push(self, *args, **kwargs):
         super().push(*args, **kwargs)
 
@@ -410,34 +476,37 @@ class Player(Character):
 
         super().collide_down(sprites, auto=auto)
 
-    def on_keyboard(self, *, event=None, keys=None):
-        if event is not None:
-            if (event.key == pygame.K_SPACE and
-                event.type == pygame.KEYUP and
-                not self.is_jumping and
-                    self.speed.y == 0):
-                self.jump()
-
-        if keys is not None:
-            if keys[pygame.K_d] and self.walk_state != WalkState.walk_right:
-                if self.walk_state == WalkState.walk_left:
-                    self.speed.x = min(0, self.speed.x + self.walk_speed)
-
-                self.speed.x += self.walk_speed
-                self.walk_state = WalkState.walk_right
-            elif not keys[pygame.K_d] and self.walk_state == WalkState.walk_right:
+    def on_actions(self, held, jump=False):
+        # Returns whether the jump was taken, a refused one stays buffered by the caller
+        jumped = jump and not self.is_jumping and self.speed.y == 0
+
+        if jumped:
+            self.jump()
+
+        right = Action.right in held
+        left = Action.left in held
+
+        if right and self.walk_state != WalkState.walk_right:
+            if self.walk_state == WalkState.walk_left:
+                self.speed.x = min(0, self.speed.x + self.walk_speed)
+
+            self.speed.x += self.walk_speed
+            self.walk_state = WalkState.walk_right
+        elif not right and self.walk_state == WalkState.walk_right:
+            self.speed.x = max(0, self.speed.x - self.walk_speed)
+            self.walk_state = WalkState.idle
+
+        if left and self.walk_state != WalkState.walk_left:
+            if self.walk_state == WalkState.walk_right:
                 self.speed.x = max(0, self.speed.x - self.walk_speed)
-                self.walk_state = WalkState.idle
 
-            if keys[pygame.K_a] and self.walk_state != WalkState.walk_left:
-                if self.walk_state == WalkState.walk_right:
-                    self.speed.x = max(0, self.speed.x - self.walk_speed)
+            self.speed.x -= self.walk_speed
+            self.walk_state = WalkState.walk_left
+        elif not left and self.walk_state == WalkState.walk_left:
+            self.speed.x = min(self.walk_speed, self.speed.x + self.walk_speed)
+            self.walk_state = WalkState.idle
 
-                self.speed.x -= self.walk_speed
-                self.walk_state = WalkState.walk_left
-            elif not keys[pygame.K_a] and self.walk_state == WalkState.walk_left:
-                self.speed.x = min(self.walk_speed, self.speed.x + self.walk_speed)
-                self.walk_state = WalkState.idle
+        return jumped
 
 
 class EnemyFrog(Character):
@@ -451,9 +520,8 @@ class EnemyFrog(Character):
 
     def __init__(self, *args,  **kwargs):
         super().__init__(*args, **kwargs)
-        self.idle_animat.frame_delay = 5
-        self.walk_animat.frame_delay = 3
         self.aggroed = False
+        self.nav_edge = None
 
     @property
     def aggro_rect(self):
@@ -488,7 +556,7 @@ class EnemyFrog(Character):
             player.push(10, 2, side=False)
             player.damage(constants.ENEMY_DAMAGE)
 
-        if self.aggroed and not self.is_jumping and player not in sprites:
+        if self.aggroed and not self.is_jumping and self.nav_edge is None and player not in sprites:
             self.push(5, 5, side=self.x_direction)
 
     def collide_right(self, sprites, auto=False):
@@ -503,7 +571,7 @@ class EnemyFrog(Character):
             player.push(10, 2, side=True)
             player.damage(constants.ENEMY_DAMAGE)
 
-        if self.aggroed and not self.is_jumping and player not in sprites:
+        if self.aggroed and not self.is_jumping and self.nav_edge is None and player not in sprites:
             self.push(5, 5, side=self.x_direction)
 
     def collide_down(self, sprites, auto=False):
@@ -517,13 +585,42 @@ class EnemyFrog(Character):
         if player is not None and player in sprites:
             player.kill()
 
-    def go_to(self, x, y):
-        if self.rect.x < x:
-            self.speed.x = max(self.speed.x, 1)
-        elif self.rect.x > x:
-            self.speed.x = min(self.speed.x, -1)
-        elif not self.is_jumping:
-            self.speed.x = 0
+    def go_to(self, target_rect):
+        if self.is_jumping:
+            edge = self.nav_edge
+
+            # Jumps go straight up until the body is level with the landing floor, then across
+            if (edge is not None and edge.kind == EdgeKind.jump and
+                    self.rect.bottom <= (edge.target.y + 1) * constants.TILE_SIZE):
+                self.speed.x = math.copysign(self.walk_speed, edge.landing_x - edge.takeoff_x)
+
+            return
+
+        self.nav_edge = self.level.navigation(type(self)).next_edge(self.rect, target_rect)
+
+        if self.nav_edge is None:
+            x = target_rect.x
+
+            if self.rect.x < x:
+                self.speed.x = max(self.speed.x, 1)
+            elif self.rect.x > x:
+                self.speed.x = min(self.speed.x, -1)
+            else:
+                self.speed.x = 0
+
+            return
+
+        if self.nav_edge.kind == EdgeKind.fall:
+            x = self.nav_edge.landing_x * constants.TILE_SIZE
+        else:
+            x = self.nav_edge.takeoff_x * constants.TILE_SIZE
+
+            if self.rect.x == x:
+                self.jump(self.nav_edge.jump_tiles)
+                self.speed.x = 0
+                return
+
+        self.speed.x = 1 if self.rect.x < x else -1
 
     def update(self, *args, **kwargs):
         super().update(*args, **kwargs)
@@ -532,7 +629,7 @@ class EnemyFrog(Character):
             return
 
         if self.level.player.alive and self.aggro_rect.colliderect(self.level.player.rect):
-            self.go_to(self.level.player.rect.x, self.level.player.rect.y)
+            self.go_to(self.level.player.rect)
             self.aggroed = True
         else:
             self.speed.x = 0
@@ -543,31 +640,36 @@ class StarBoss(Character):
 
     ADDITIONAL_GROUPS = [sprite_groups.CHARACTERS]
 
+    @property
+    def is_hurt(self):
+        return 50 <= self.health < 100
+
+    @property
+    def is_critical(self):
+        return self.health < 50
+
     def kill(self):
         self.level.finish()
         super().kill()
 
-    def update(self, *args, **kwargs):
-        super().update(*args, **kwargs)
 
-        if self.health == 100:
-            self.idle_animat.frame_delay = 4
-        elif self.health >= 50:
-            self.idle_animat.frame_delay = 3
-        else:
-            self.idle_animat.frame_delay = 2
-
-
-class StarStone(GameObject):
-
-    MASS = 10
+class StarStone(TriggerObject):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.activated = False
-        self.regular_image = self.image.copy()
+        self.regular_image = self.image
         self.activated_image = utils.load_image(f"{self.__class__.__name__.lower()}_activated.png")
 
+    @classmethod
+    def frame_images(cls):
+        name = cls.__name__.lower()
+        return [utils.load_image(f"{name}.png"), utils.load_image(f"{name}_activated.png")]
+
+    @property
+    def frame_id(self):
+        return int(self.activated)
+
     def toggle_activated(self):
         if self.activated:
             self.image = self.regular_image
@@ -576,16 +678,24 @@ class StarStone(GameObject):
             self.image = self.activated_image
             self.activated = True
 
-    def update(self, *args, **kwargs):
-        super().update(*args, **kwargs)
+    def trigger_zone(self):
+        # A stone activated while the player already stands on it counts on the next tick too
+        return TriggerZone(self.rect, on_enter=self.on_press, on_stay=self.on_press)
 
-        if self.level is None or not self.level.star_boss.alive:
+    def on_press(self, actor):
+        if actor is not self.level.player or not self.level.star_boss.alive:
             return
 
-        if pygame.sprite.collide_rect(self, self.level.player):
-            if self.activated:
-                self.level.star_boss.damage(14.5)
-                self.toggle_activated()
-                self.level.activate_stone()
-            else:
-                self.level.player.damage(1)
+        if self.activated:
+            self.level.star_boss.damage(14.5)
+            self.toggle_activated()
+            self.level.activate_stone()
+        else:
+            actor.damage(1)
+
+
+# Index is the type id in the network protocol
+OBJECT_TYPES = (
+    BackgroundTile, BackgroundBrick, GroundTile, Brick, Box, LevelPointer, StarBoss, StarStone, EnemyFrog, Player
+)
+TYPE_IDS = {object_type: type_id for type_id, object_type in enumerate(OBJECT_TYPES)}
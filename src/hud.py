@@ -0,0 +1,151 @@
+import pygame
+
+from . import constants, utils
+from .utils import cached_property
+
+
+def health_color(health):
+    if health >= 70:
+        return constants.GREEN_COLOR
+    elif health >= 40:
+        return constants.ORANGE_COLOR
+
+    return constants.RED_COLOR
+
+
+class TextCache(utils.LRUCache):
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.get(key)
+
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.put(key, surface)
+
+        return surface
+
+
+class Hud:
+
+    def __init__(self, game):
+        self.game = game
+        self.text_cache = TextCache(constants.TEXT_CACHE_SIZE)
+        self.health_bars = utils.LRUCache(constants.HEALTH_BAR_CACHE_SIZE)
+        self.overlay = None
+        self.overlay_pos = (0, 0)
+        self._overlay_values = None
+        self.show_debug = False
+        self.debug_overlay = None
+        self._debug_frame = None
+
+    @cached_property
+    def font(self):
+        return utils.load_font("joysix.ttf", 40)
+
+    @cached_property
+    def debug_font(self):
+        return utils.load_font("joysix.ttf", 16)
+
+    def health_bar(self, width, health):
+        key = (width, health)
+        surface = self.health_bars.get(key)
+
+        if surface is None:
+            surface = pygame.Surface((width, 4), pygame.SRCALPHA)
+            pygame.draw.rect(surface, health_color(health), (0, 0, width / 100 * health, 4))
+            self.health_bars.put(key, surface)
+
+        return surface
+
+    def values(self):
+        level = self.game.current_level
+
+        if level is None:
+            return None, None
+
+        boss = level.boss
+        boss_health = boss.health if boss is not None and boss.alive else None
+        return boss_health, level.status_text
+
+    def render_overlay(self, size, boss_health, status_text):
+        # Drawn at window resolution, on top of the scaled world
+        width, height = size
+        overlay = pygame.Surface(size, pygame.SRCALPHA)
+
+        if boss_health is not None:
+            bar_width = width // 3
+            bar_x = (width - bar_width) // 2
+            pygame.draw.rect(overlay, constants.BOSS_HEALTH_BACKGROUND, (bar_x, 20, bar_width, 10))
+            pygame.draw.rect(overlay, health_color(boss_health), (bar_x, 20, bar_width / 100 * boss_health, 10))
+
+        if status_text:
+            text_surface = self.text_cache.render(self.font, status_text, constants.WHITE_COLOR)
+            overlay.blit(text_surface, (width // 2 - text_surface.get_width() // 2, height // 2))
+
+        bounding_rect = overlay.get_bounding_rect()
+
+        if bounding_rect.width == 0 or bounding_rect.height == 0:
+            self.overlay = None
+        else:
+            self.overlay = overlay.subsurface(bounding_rect).copy()
+            self.overlay_pos = bounding_rect.topleft
+
+    def debug_lines(self):
+        game = self.game
+        scheduler = game.scheduler.stats
+        render_target = game.render_target
+        lines = [
+            f"fps {scheduler['fps']:.0f} work {scheduler['average_work_time']:.1f}/{scheduler['max_work_time']:.1f} ms",
+            f"blits {sum(render_target.layer_blits)} render {sum(render_target.layer_times):.2f} ms",
+        ]
+
+        for name, stats in game.controls.stats.items():
+            lines.append(f"{name} {stats['average']:.1f} ms max {stats['max']:.1f} ({stats['count']})")
+
+        return lines
+
+    def render_debug_overlay(self):
+        lines = [self.debug_font.render(line, False, constants.WHITE_COLOR) for line in self.debug_lines()]
+        line_height = self.debug_font.get_linesize()
+        overlay = pygame.Surface(
+            (max(line.get_width() for line in lines) + 8, line_height * len(lines) + 8), pygame.SRCALPHA
+        )
+        overlay.fill(constants.BOSS_HEALTH_BACKGROUND)
+
+        for index, line in enumerate(lines):
+            overlay.blit(line, (4, 4 + index * line_height))
+
+        self.debug_overlay = overlay
+
+    def blits(self, size):
+        values = (size, *self.values())
+
+        if values != self._overlay_values:
+            self._overlay_values = values
+            self.render_overlay(*values)
+
+        items = []
+        player = self.game.player
+
+        if player is not None and player.alive:
+            target = self.game.render_target
+            bar_width = round(player.rect.width * target.window_factor[0])
+            items.append((
+                self.health_bar(bar_width, player.health), target.to_window(player.rect.x, player.rect.y - 12)
+            ))
+
+        if self.overlay is not None:
+            items.append((self.overlay, self.overlay_pos))
+
+        if self.show_debug:
+            # Numbers change every frame, so the text is only re-rendered every few frames
+            frame = self.game.scheduler.frames
+
+            if self._debug_frame is None or frame - self._debug_frame >= constants.DEBUG_OVERLAY_REFRESH:
+                self._debug_frame = frame
+                self.render_debug_overlay()
+
+            items.append((self.debug_overlay, (8, 8)))
+
+        return items
@@ -2,7 +2,9 @@ import random
 import pygame
 import abc
 
-from . import game_objects, utils, constants
+from . import game_objects, navigation, utils, constants
+from .rendering import STATIC_LAYERS
+from .utils import cached_property
 
 
 class Level(pygame.sprite.Group, abc.ABC):
@@ -13,11 +15,28 @@ class Level(pygame.sprite.Group, abc.ABC):
         self.x_tiles = game.x_tiles
         self.y_tiles = game.y_tiles
         self.player = None
+        self.dynamic_objects = []
+        self.tiles = []
+        self.navigation_graphs = {}
+        self.triggers = []
+        self.actors = []
+        # Sprites the telemetry records each tick, rebuilt only when the level is created or killed
+        self.tracked = []
+        # Blits of the tiles per detail level, they never move while the level lives
+        self.static_blits = {}
 
     @property
     def start_tile(self):
         return 1, self.y_tiles - 2
 
+    @property
+    def boss(self):
+        return None
+
+    @property
+    def status_text(self):
+        return None
+
     @abc.abstractmethod
     def schema(self):
         """
@@ -27,6 +46,52 @@ class Level(pygame.sprite.Group, abc.ABC):
         """
         raise NotImplementedError()
 
+    @cached_property
+    def background_color(self):
+        for sprite in self:
+            if sprite.DECORATIVE:
+                return pygame.transform.average_color(sprite.image)[:3]
+
+        return 0, 0, 0
+
+    def navigation(self, character_cls):
+        graph = self.navigation_graphs.get(character_cls)
+
+        if graph is None:
+            graph = self.navigation_graphs[character_cls] = navigation.NavGraph.from_level(self, character_cls)
+
+        return graph
+
+    def add_trigger(self, zone):
+        self.triggers.append(zone)
+
+    def add_actor(self, actor):
+        self.actors.append(actor)
+
+    def update_triggers(self):
+        # Only registered actors are tested, one collidelistall per zone
+        actors = [actor for actor in self.actors if actor.alive]
+        rects = [actor.rect for actor in actors]
+        triggers = self.triggers
+        events = [event for zone in triggers for event in zone.events(actors, rects)]
+
+        for callback, actor in events:
+            # A callback may restart or switch the level, the rest of the events are stale then
+            if self.triggers is not triggers:
+                break
+
+            callback(actor)
+
+    def settle(self, sprite):
+        # Puts a sprite on the first solid tile below its top edge, like falling with gravity would
+        left = sprite.rect.left // constants.TILE_SIZE
+        right = (sprite.rect.right - 1) // constants.TILE_SIZE
+
+        for y in range(sprite.rect.top // constants.TILE_SIZE + 1, self.y_tiles):
+            if any(self.tiles[y][x].solid for x in range(left, right + 1)):
+                sprite.rect.bottom = y * constants.TILE_SIZE
+                return
+
     def start_point(self):
         return utils.tile_point(*self.start_tile)
 
@@ -54,12 +119,55 @@ class Level(pygame.sprite.Group, abc.ABC):
             self.add(sprite_object)
             sprite_object.rect.x, sprite_object.rect.y = pos
 
+        self.dynamic_objects = [sprite_object for sprite_object, _ in objects]
+        self.tiles = tiles
+        self.navigation_graphs.clear()
+        self.triggers = []
+        self.actors = [] if self.player is None else [self.player]
+        self.tracked = self.dynamic_objects + self.actors
+        self.static_blits.clear()
+
+        for sprite_object in self.dynamic_objects:
+            if isinstance(sprite_object, game_objects.TriggerObject):
+                self.settle(sprite_object)
+                self.add_trigger(sprite_object.trigger_zone())
+
         return tiles, objects
 
+    def queue_static(self, detailed):
+        blits = self.static_blits.get(detailed)
+
+        if blits is None:
+            blits = self.static_blits[detailed] = tuple(
+                tuple(
+                    (sprite.image, sprite.rect.topleft) for row in self.tiles for sprite in row
+                    if sprite.RENDER_LAYER == layer and (detailed or not sprite.DECORATIVE)
+                )
+                for layer in STATIC_LAYERS
+            )
+
+        return blits
+
+    def queue_draw(self, queue, detailed=True):
+        for layer, items in zip(STATIC_LAYERS, self.queue_static(detailed)):
+            queue.set_static(layer, items)
+
+        queue.add_sprites([
+            sprite for sprite in self.dynamic_objects if self.has(sprite) and (detailed or not sprite.DECORATIVE)
+        ])
+
     def kill(self):
         for sprite in self:
             sprite.kill()
 
+        self.dynamic_objects = []
+        self.tiles = []
+        self.navigation_graphs.clear()
+        self.triggers = []
+        self.actors = []
+        self.tracked = []
+        self.static_blits.clear()
+
 
 class FirstLevel(Level):
 
@@ -98,12 +206,20 @@ class SecondLevel(Level):
         self.star_stones = []
         self.stone_streak = 0
         self.finished = False
-        self.sf_font = pygame.font.Font(utils.ASSETS_PATH / "fonts/joysix.ttf", 40)
 
     @property
     def start_tile(self):
         return self.x_tiles // 2, self.y_tiles - 2
 
+    @property
+    def boss(self):
+        return self.star_boss
+
+    @property
+    def status_text(self):
+        if self.finished:
+            return constants.WIN_TEXT
+
     def kill(self):
         super().kill()
         self.star_boss = None
@@ -166,12 +282,3 @@ class SecondLevel(Level):
                 stone.toggle_activated()
 
         self.finished = True
-
-    def update(self, *args, **kwargs):
-        super().update(*args, **kwargs)
-
-        if self.finished:
-            text_surface = self.sf_font.render(constants.WIN_TEXT, True, (255, 255, 255))
-            text_pos = utils.tile_point(self.x_tiles // 2, self.y_tiles // 2)
-            text_pos[0] -= text_surface.get_width() // 2
-            args[0].blit(text_surface, text_pos)
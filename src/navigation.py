@@ -0,0 +1,221 @@
+import heapq
+import math
+
+from enum import Enum
+
+from . import constants
+
+
+class EdgeKind(Enum):
+
+    fall = 0
+    jump = 1
+
+
+class Span:
+
+    # Maximal run of free tiles on one row with solid ground under each of them.
+    # Walking anywhere inside a span needs no edge
+
+    def __init__(self, index, y, left, right):
+        self.index = index
+        self.y = y
+        self.left = left
+        self.right = right
+        self.edges = []
+
+    def __repr__(self):
+        return f"<Span #{self.index} y={self.y} x={self.left}..{self.right}>"
+
+    def nearest(self, x):
+        return min(max(x, self.left), self.right)
+
+
+class Edge:
+
+    def __init__(self, kind, source, target, takeoff_x, landing_x, jump_tiles=0):
+        self.kind = kind
+        self.source = source
+        self.target = target
+        self.takeoff_x = takeoff_x
+        self.landing_x = landing_x
+        self.jump_tiles = jump_tiles
+        self.cost = abs(landing_x - takeoff_x) + (2 if kind == EdgeKind.jump else 1)
+
+    def __repr__(self):
+        return f"<Edge {self.kind.name} {self.source.index}->{self.target.index} x={self.takeoff_x}->{self.landing_x}>"
+
+
+class NavGraph:
+
+    def __init__(self, solid, jump_tiles, walk_speed, jump_speed):
+        self.solid = solid
+        self.height = len(solid)
+        self.width = len(solid[0]) if solid else 0
+        self.jump_tiles = jump_tiles
+        self.walk_speed = walk_speed
+        self.jump_speed = jump_speed
+        self.spans = []
+        self.standing = {}
+        self.landing = {}
+        self.paths = {}
+        self._build_spans()
+        self._build_landing()
+        self._build_edges()
+
+    @classmethod
+    def from_level(cls, level, character_cls):
+        solid = [[sprite.solid for sprite in row] for row in level.tiles]
+        return cls(solid, character_cls.JUMP_TILES, character_cls.WALK_SPEED, character_cls.JUMP_SPEED)
+
+    def free(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and not self.solid[y][x]
+
+    def _build_spans(self):
+        for y in range(self.height - 1):
+            x = 0
+
+            while x < self.width:
+                if self.free(x, y) and not self.free(x, y + 1):
+                    left = x
+
+                    while x + 1 < self.width and self.free(x + 1, y) and not self.free(x + 1, y + 1):
+                        x += 1
+
+                    self.spans.append(Span(len(self.spans), y, left, x))
+
+                x += 1
+
+    def _build_landing(self):
+        # For every free tile, the span a body in it ends up on when it falls straight down
+        standing = self.standing
+        standing.update((((x, span.y), span) for span in self.spans for x in range(span.left, span.right + 1)))
+
+        for x in range(self.width):
+            span = None
+
+            for y in reversed(range(self.height)):
+                if not self.free(x, y):
+                    span = None
+                    continue
+
+                span = standing.get((x, y), span)
+
+                if span is not None:
+                    self.landing[x, y] = span
+
+    def _column_free(self, x, top, bottom):
+        return all(self.free(x, y) for y in range(top, bottom + 1))
+
+    def _row_free(self, y, x1, x2):
+        return all(self.free(x, y) for x in range(min(x1, x2), max(x1, x2) + 1))
+
+    def _jump_reach(self):
+        ascent_ticks = self.jump_tiles * constants.TILE_SIZE / ((self.jump_speed ** 2) * 0.5)
+        return math.ceil(ascent_ticks * self.walk_speed / constants.TILE_SIZE) + 1
+
+    def _build_edges(self):
+        reach = self._jump_reach()
+
+        for span in self.spans:
+            for takeoff_x, side_x in ((span.left, span.left - 1), (span.right, span.right + 1)):
+                target = self.landing.get((side_x, span.y))
+
+                if target is not None and target is not span:
+                    span.edges.append(Edge(EdgeKind.fall, span, target, takeoff_x, side_x))
+
+            for target in self.spans:
+                if target is span or target.y > span.y:
+                    continue
+
+                edge = self._jump_edge(span, target, reach)
+
+                if edge is not None:
+                    span.edges.append(edge)
+
+    def _jump_edge(self, span, target, reach):
+        # The flight is checked as an L: straight up in the takeoff column to the higher floor
+        # (one row above it for jumps within a row), across, and down onto the landing tile
+        apex = target.y if target.y < span.y else span.y - 1
+        jump_tiles = span.y - apex
+
+        if apex < 0 or jump_tiles > self.jump_tiles:
+            return None
+
+        candidates = sorted(range(span.left, span.right + 1), key=lambda x: abs(target.nearest(x) - x))
+
+        for takeoff_x in candidates:
+            landing_x = target.nearest(takeoff_x)
+
+            if abs(landing_x - takeoff_x) > reach:
+                break
+
+            if (self._column_free(takeoff_x, apex, span.y) and
+                    self._row_free(apex, takeoff_x, landing_x) and
+                    self._column_free(landing_x, apex, target.y)):
+                return Edge(EdgeKind.jump, span, target, takeoff_x, landing_x, min(jump_tiles + 1, self.jump_tiles))
+
+        return None
+
+    def locate(self, rect):
+        # A body stands on a span if any of its feet is over it, otherwise it will land below its center
+        row = (rect.bottom - 1) // constants.TILE_SIZE
+
+        for x in (rect.centerx, rect.left, rect.right - 1):
+            span = self.standing.get((x // constants.TILE_SIZE, row))
+
+            if span is not None:
+                return span
+
+        return self.landing.get((rect.centerx // constants.TILE_SIZE, row))
+
+    def path(self, start, goal):
+        key = (start.index, goal.index)
+
+        try:
+            return self.paths[key]
+        except KeyError:
+            pass
+
+        costs = {start.index: 0}
+        previous = {}
+        queue = [(0, start.index)]
+        path = None
+
+        while queue:
+            cost, index = heapq.heappop(queue)
+
+            if index == goal.index:
+                path = []
+
+                while index != start.index:
+                    edge = previous[index]
+                    path.append(edge)
+                    index = edge.source.index
+
+                path.reverse()
+                break
+
+            if cost > costs[index]:
+                continue
+
+            for edge in self.spans[index].edges:
+                new_cost = cost + edge.cost
+
+                if new_cost < costs.get(edge.target.index, math.inf):
+                    costs[edge.target.index] = new_cost
+                    previous[edge.target.index] = edge
+                    heapq.heappush(queue, (new_cost, edge.target.index))
+
+        self.paths[key] = path
+        return path
+
+    def next_edge(self, rect, target_rect):
+        start = self.locate(rect)
+        goal = self.locate(target_rect)
+
+        if start is None or goal is None or start is goal:
+            return None
+
+        path = self.path(start, goal)
+        return path[0] if path else None
@@ -0,0 +1,103 @@
+import threading
+import time
+import pygame
+
+
+class RenderPipeline:
+
+    # Double buffer between the simulation and a render thread. The simulation fills the back
+    # slot while the thread draws and flips the front one, and waits if the back slot is still
+    # taken, so it never runs more than one frame ahead and every snapshot is drawn in order.
+    # Blits and flips release the GIL, which lets the next tick overlap them
+
+    def __init__(self, render_target, on_present=None):
+        self.render_target = render_target
+        self.on_present = on_present
+        self.condition = threading.Condition()
+        self.pending = None
+        self.rendering = False
+        self.running = False
+        self.thread = None
+        self.error = None
+        self.frames = 0
+        self.render_time = 0.0
+        self.wait_time = 0.0
+
+    def start(self):
+        if self.running:
+            return
+
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self.thread.start()
+
+    def _check_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def submit(self, snapshot):
+        started_at = time.perf_counter()
+
+        with self.condition:
+            while self.pending is not None and self.running:
+                self.condition.wait()
+
+            self._check_error()
+            self.pending = snapshot
+            self.condition.notify_all()
+
+        self.wait_time = (time.perf_counter() - started_at) * 1000
+
+    def flush(self):
+        # Blocks until everything submitted is on screen, e.g. before the main thread draws itself
+        with self.condition:
+            while (self.pending is not None or self.rendering) and self.running:
+                self.condition.wait()
+
+            self._check_error()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and self.running:
+                    self.condition.wait()
+
+                if self.pending is None:
+                    return
+
+                snapshot, self.pending = self.pending, None
+                self.rendering = True
+                self.condition.notify_all()
+
+            started_at = time.perf_counter()
+
+            try:
+                self.render_target.render(snapshot)
+                pygame.display.flip()
+
+                if self.on_present is not None:
+                    self.on_present(snapshot)
+            except Exception as error:
+                self.error = error
+                self.running = False
+
+            self.render_time = (time.perf_counter() - started_at) * 1000
+
+            with self.condition:
+                self.rendering = False
+                self.frames += 1
+                self.condition.notify_all()
+
+    def stop(self):
+        if not self.running:
+            return
+
+        self.flush()
+
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+        self.thread.join()
+        self.thread = None
@@ -0,0 +1,178 @@
+import struct
+
+from . import constants
+from .controls import Action
+
+# Messages are framed as <length:u32><type:u8><body>, little-endian
+
+MESSAGE_HEADER = struct.Struct("<IB")
+
+JOIN = 1
+INPUT = 2
+ACK = 3
+WELCOME = 4
+STATE = 5
+
+JOIN_BODY = struct.Struct("<HB")
+INPUT_BODY = struct.Struct("<BH")  # held actions, jump presses so far (wraps)
+ACK_BODY = struct.Struct("<I")
+WELCOME_BODY = struct.Struct("<HHH")
+STATE_HEADER = struct.Struct("<IIHH")
+
+# Bodies of the messages a client sends, the server drops a client sending any other size
+CLIENT_BODIES = {
+    JOIN: JOIN_BODY,
+    INPUT: INPUT_BODY,
+    ACK: ACK_BODY,
+}
+
+ENTITY_HEADER = struct.Struct("<IB")
+OBJECT_ID = struct.Struct("<I")
+FIELDS = (
+    struct.Struct("<B"),  # type id
+    struct.Struct("<h"),  # x
+    struct.Struct("<h"),  # y
+    struct.Struct("<B"),  # health
+    struct.Struct("<H"),  # frame id
+)
+
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_JUMP = 4
+
+ACTION_BITS = {
+    Action.left: INPUT_LEFT,
+    Action.right: INPUT_RIGHT,
+    Action.jump: INPUT_JUMP,
+}
+
+
+def input_mask(actions):
+    mask = 0
+
+    for action, bit in ACTION_BITS.items():
+        if action in actions:
+            mask |= bit
+
+    return mask
+
+
+def mask_actions(mask):
+    return {action for action, bit in ACTION_BITS.items() if mask & bit}
+
+
+def new_presses(presses, previous):
+    # Press counters are u16 and wrap around
+    return (presses - previous) & 0xFFFF
+
+
+def message(message_type, body=b""):
+    return MESSAGE_HEADER.pack(len(body) + 1, message_type) + body
+
+
+def read_messages(buffer):
+    """
+    Забирает из bytearray все полностью полученные сообщения.
+    Возвращает List[Tuple[int, bytes]]
+    """
+    messages = []
+
+    while len(buffer) >= MESSAGE_HEADER.size:
+        length, message_type = MESSAGE_HEADER.unpack_from(buffer)
+        end = MESSAGE_HEADER.size - 1 + length
+
+        if len(buffer) < end:
+            break
+
+        messages.append((message_type, bytes(buffer[MESSAGE_HEADER.size:end])))
+        del buffer[:end]
+
+    return messages
+
+
+def encode_state(tick, base_tick, base, state):
+    changed = []
+    removed = [object_id for object_id in base if object_id not in state]
+
+    for object_id, values in state.items():
+        base_values = base.get(object_id)
+
+        if base_values == values:
+            continue
+
+        mask = 0
+        fields = []
+
+        for bit, value in enumerate(values):
+            if base_values is None or base_values[bit] != value:
+                mask |= 1 << bit
+                fields.append(FIELDS[bit].pack(value))
+
+        changed.append(ENTITY_HEADER.pack(object_id, mask) + b"".join(fields))
+
+    return message(STATE, b"".join((
+        STATE_HEADER.pack(tick, base_tick, len(changed), len(removed)),
+        *changed,
+        *(OBJECT_ID.pack(object_id) for object_id in removed)
+    )))
+
+
+def decode_state(body, base):
+    tick, _, changed_count, removed_count = STATE_HEADER.unpack_from(body)
+    offset = STATE_HEADER.size
+    state = dict(base)
+
+    for _ in range(changed_count):
+        object_id, mask = ENTITY_HEADER.unpack_from(body, offset)
+        offset += ENTITY_HEADER.size
+        values = list(state.get(object_id, (0, 0, 0, 0, 0)))
+
+        for bit, field in enumerate(FIELDS):
+            if mask & (1 << bit):
+                values[bit], = field.unpack_from(body, offset)
+                offset += field.size
+
+        state[object_id] = tuple(values)
+
+    for _ in range(removed_count):
+        object_id, = OBJECT_ID.unpack_from(body, offset)
+        offset += OBJECT_ID.size
+        state.pop(object_id, None)
+
+    return tick, state
+
+
+def state_base_tick(body):
+    return STATE_HEADER.unpack_from(body)[1]
+
+
+class StateBuffer:
+
+    # Client side of the delta stream: keeps recent states so any acked tick can be a base
+
+    def __init__(self):
+        self.states = {0: {}}
+        self.tick = 0
+
+    @property
+    def state(self):
+        return self.states[self.tick]
+
+    def apply(self, body):
+        base_tick = state_base_tick(body)
+
+        if base_tick not in self.states:
+            return None
+
+        tick, state = decode_state(body, self.states[base_tick])
+
+        if tick <= self.tick:
+            return None
+
+        self.states[tick] = state
+        self.tick = tick
+
+        for old_tick in [t for t in self.states if 0 < t <= tick - constants.STATE_HISTORY_TICKS]:
+            del self.states[old_tick]
+
+        return tick
@@ -0,0 +1,216 @@
+import time
+import weakref
+import pygame
+
+from enum import Enum
+
+from . import constants
+
+
+class RenderLayer(Enum):
+
+    # Drawn in this order; hud is in window pixels, everything else in world pixels
+    background = 0
+    terrain = 1
+    objects = 2
+    characters = 3
+    player = 4
+    hud = 5
+
+
+WORLD_LAYERS = tuple(layer for layer in RenderLayer if layer != RenderLayer.hud)
+# Tiles that stay put for the whole level, pre-rendered once instead of blitted every frame
+STATIC_LAYERS = (RenderLayer.background, RenderLayer.terrain)
+DYNAMIC_LAYERS = tuple(layer for layer in WORLD_LAYERS if layer not in STATIC_LAYERS)
+
+
+class RenderQueue:
+
+    # Draw commands of one frame, an (image, position) list per layer
+
+    def __init__(self):
+        self.layers = [[] for _ in RenderLayer]
+
+    def add(self, layer, image, position):
+        self.layers[layer.value].append((image, position))
+
+    def extend(self, layer, items):
+        self.layers[layer.value].extend(items)
+
+    def set_static(self, layer, items):
+        # Takes a tuple the caller keeps between frames, so the render target can tell it is unchanged
+        self.layers[layer.value] = items
+
+    def add_sprites(self, sprites):
+        layers = self.layers
+
+        for sprite in sprites:
+            layers[sprite.RENDER_LAYER.value].append((sprite.image, sprite.rect.topleft))
+
+
+class RenderSnapshot:
+
+    # Everything a frame needs, detached from the live sprites: image refs and copied positions
+
+    def __init__(self, frame, background, queue, presses=()):
+        self.frame = frame
+        self.background = background
+        self.layers = tuple(tuple(items) for items in queue.layers)
+        # (action, pressed at) of inputs this frame is the first to show
+        self.presses = tuple(presses)
+
+
+class RenderTarget:
+
+    # The world is laid out in world_size pixels, drawn into a render surface of
+    # world_size * scale and scaled once per frame to the window
+
+    def __init__(self, window, world_size=constants.WORLD_SIZE, scale=1.0, smooth=False):
+        self.window = window
+        self.world_size = tuple(world_size)
+        self.scale = scale
+        self.smooth = smooth
+        self.size = (round(self.world_size[0] * scale), round(self.world_size[1] * scale))
+        self.scaled_images = weakref.WeakKeyDictionary()
+        self.layer_blits = [0] * len(RenderLayer)
+        self.layer_times = [0.0] * len(RenderLayer)
+        self.present_time = 0.0
+        self.static_key = None
+        self.static_surface = None
+        # Rects drawn over the static image since it was last laid down, None when all of it is stale
+        self.dirty = None
+
+        if self.size == self.window_size:
+            self.surface = window
+        else:
+            self.surface = pygame.Surface(self.size)
+
+    @property
+    def window_size(self):
+        return self.window.get_size()
+
+    @property
+    def presents(self):
+        return self.surface is not self.window
+
+    @property
+    def window_factor(self):
+        width, height = self.window_size
+        return width / self.world_size[0], height / self.world_size[1]
+
+    def to_window(self, x, y):
+        factor_x, factor_y = self.window_factor
+        return round(x * factor_x), round(y * factor_y)
+
+    def scaled_image(self, image, size):
+        # Surfaces hash by identity, and the weak keys drop copies of images that are gone.
+        # An image can need two sizes, one pixel apart, depending on where it lands
+        sizes = self.scaled_images.get(image)
+
+        if sizes is None:
+            sizes = self.scaled_images[image] = {}
+
+        scaled = sizes.get(size)
+
+        if scaled is None:
+            scaled = sizes[size] = pygame.transform.scale(image, size)
+
+        return scaled
+
+    def scaled_blit(self, image, position):
+        # Edges are rounded, not sizes, so neighbouring tiles share an edge and leave no seams
+        scale = self.scale
+        x, y = position[0], position[1]
+        width, height = image.get_size()
+        left, top = round(x * scale), round(y * scale)
+        size = (max(1, round((x + width) * scale) - left), max(1, round((y + height) * scale) - top))
+        return self.scaled_image(image, size), (left, top)
+
+    def blits(self, sequence, surface=None, doreturn=False):
+        if surface is None:
+            surface = self.surface
+
+        if self.scale == 1:
+            return surface.blits(sequence, doreturn)
+
+        scaled_blit = self.scaled_blit
+        return surface.blits([scaled_blit(image, position) for image, position in sequence], doreturn)
+
+    def invalidate(self):
+        # Something else drew on the surface, e.g. the pause menu on the window
+        self.dirty = None
+
+    def static_layers(self, snapshot):
+        # Rebuilt only when the background color or a static tile changes, e.g. on a level switch.
+        # Comparing the layers is a C-level walk over tuples, far cheaper than scaling and blitting them
+        layers = snapshot.layers
+        key = (snapshot.background, *(layers[layer.value] for layer in STATIC_LAYERS))
+
+        if key == self.static_key:
+            return self.static_surface
+
+        self.static_key = key
+        self.dirty = None
+        self.static_surface = surface = pygame.Surface(self.size, 0, self.surface)
+        surface.fill(snapshot.background)
+
+        for layer in STATIC_LAYERS:
+            self.blits(layers[layer.value], surface)
+
+        return surface
+
+    def present(self):
+        if not self.presents:
+            return
+
+        if self.smooth:
+            pygame.transform.smoothscale(self.surface, self.window_size, self.window)
+        else:
+            pygame.transform.scale(self.surface, self.window_size, self.window)
+
+    @property
+    def layer_stats(self):
+        # Blit count and milliseconds per layer in the last rendered frame
+        return {
+            layer.name: {"blits": self.layer_blits[layer.value], "time": self.layer_times[layer.value]}
+            for layer in RenderLayer
+        }
+
+    def render(self, snapshot):
+        perf_counter = time.perf_counter
+        started_at = perf_counter()
+        static = self.static_layers(snapshot)
+
+        # Only what the moving sprites covered last frame is copied back from the static image
+        if self.dirty is None:
+            self.surface.blit(static, (0, 0))
+        else:
+            self.surface.blits([(static, rect, rect) for rect in self.dirty], False)
+
+        static_time = (perf_counter() - started_at) * 1000
+        dirty = []
+
+        # The static layers share one restore, its time is reported under the first of them
+        for layer in STATIC_LAYERS:
+            self.layer_blits[layer.value] = len(snapshot.layers[layer.value])
+            self.layer_times[layer.value] = static_time
+            static_time = 0.0
+
+        for layer in DYNAMIC_LAYERS:
+            items = snapshot.layers[layer.value]
+            started_at = perf_counter()
+            dirty += self.blits(items, doreturn=True)
+            self.layer_blits[layer.value] = len(items)
+            self.layer_times[layer.value] = (perf_counter() - started_at) * 1000
+
+        started_at = perf_counter()
+        self.present()
+        self.present_time = (perf_counter() - started_at) * 1000
+        items = snapshot.layers[RenderLayer.hud.value]
+        started_at = perf_counter()
+        hud_rects = self.window.blits(items)
+
+        # Presenting repaints the whole window, otherwise the hud lands on the render surface itself
+        self.dirty = dirty if self.presents else dirty + hud_rects
+        self.layer_blits[RenderLayer.hud.value] = len(items)
+        self.layer_times[RenderLayer.hud.value] = (perf_counter() - started_at) * 1000
@@ -0,0 +1,144 @@
+import time
+import pygame
+
+from collections import deque
+from enum import Enum
+
+from . import constants
+
+
+class FramePrecision(Enum):
+
+    sleep = 0
+    busy = 1
+
+
+class FrameScheduler:
+
+    def __init__(self, target_fps=constants.GAME_FPS, precision=FramePrecision.sleep, *,
+                 skip_frames=False, adapt_quality=False):
+        self.clock = pygame.time.Clock()
+        self.target_fps = target_fps
+        self.precision = precision
+        self.skip_frames = skip_frames
+        self.adapt_quality = adapt_quality
+        self.reduced_quality = False
+        self.frames = 0
+        self.missed_frames = 0
+        self.skipped_frames = 0
+        self.consecutive_misses = 0
+        self.consecutive_skips = 0
+        self.on_time_streak = 0
+        self.last_frame_missed = False
+        self.ticked_at = None
+        self.pumped_at = None
+        # Milliseconds spent handling events in the last pump, the wait around them excluded
+        self.event_time = 0.0
+        self.work_times = deque(maxlen=constants.FRAME_STATS_WINDOW)
+
+    @property
+    def unlocked(self):
+        return not self.target_fps
+
+    @property
+    def frame_budget(self):
+        if self.unlocked:
+            return None
+
+        return 1000 / self.target_fps
+
+    def pump_events(self, on_event):
+        # Waits out the frame in event.wait slices so events are handled and stamped as they arrive.
+        # Whatever queued while the frame worked is stamped with the previous pump, before it arrived
+        pumped_at = self.pumped_at
+        started_at = time.perf_counter() * 1000
+
+        for event in pygame.event.get():
+            on_event(event, pumped_at)
+
+        event_time = time.perf_counter() * 1000 - started_at
+
+        if not self.unlocked and self.ticked_at is not None:
+            deadline = self.ticked_at + self.frame_budget
+            remaining = deadline - time.perf_counter() * 1000
+
+            while remaining >= 1:
+                event = pygame.event.wait(int(remaining))
+                remaining = deadline - time.perf_counter() * 1000
+
+                if event.type != pygame.NOEVENT:
+                    started_at = time.perf_counter() * 1000
+                    on_event(event, started_at)
+                    event_time += time.perf_counter() * 1000 - started_at
+
+        self.event_time = event_time
+        self.pumped_at = time.perf_counter() * 1000
+
+    def tick(self, on_event=None):
+        # With on_event the sleep also pumps events, the clock only sleeps off the last millisecond
+        started_at = time.perf_counter() * 1000
+        work_time = 0 if self.ticked_at is None else started_at - self.ticked_at
+
+        if on_event is not None:
+            self.pump_events(on_event)
+
+        if self.unlocked:
+            time_delta = self.clock.tick()
+        elif self.precision == FramePrecision.busy:
+            time_delta = self.clock.tick_busy_loop(self.target_fps)
+        else:
+            time_delta = self.clock.tick(self.target_fps)
+
+        self.ticked_at = time.perf_counter() * 1000
+        budget = self.frame_budget
+        self.frames += 1
+        self.work_times.append(work_time)
+        self.last_frame_missed = budget is not None and work_time > budget
+
+        if self.last_frame_missed:
+            self.missed_frames += 1
+            self.consecutive_misses += 1
+            self.on_time_streak = 0
+        else:
+            self.consecutive_misses = 0
+            self.on_time_streak += 1
+
+        if self.adapt_quality:
+            if not self.reduced_quality and self.consecutive_misses >= constants.QUALITY_DROP_MISSES:
+                self.reduced_quality = True
+            elif self.reduced_quality and self.on_time_streak >= constants.QUALITY_RESTORE_FRAMES:
+                self.reduced_quality = False
+
+        return time_delta / 1000
+
+    def idle_tick(self):
+        # Paused frames are paced by the event wait, this only keeps the clock and the frame start current
+        time_delta = self.clock.tick()
+        self.ticked_at = time.perf_counter() * 1000
+        return time_delta / 1000
+
+    def should_render(self):
+        if (self.skip_frames and
+                self.last_frame_missed and
+                self.consecutive_skips < constants.MAX_SKIPPED_FRAMES):
+            self.consecutive_skips += 1
+            self.skipped_frames += 1
+            return False
+
+        self.consecutive_skips = 0
+        return True
+
+    @property
+    def stats(self):
+        work_times = self.work_times or [0]
+
+        return {
+            "target_fps": self.target_fps,
+            "fps": self.clock.get_fps(),
+            "frames": self.frames,
+            "missed_frames": self.missed_frames,
+            "skipped_frames": self.skipped_frames,
+            "reduced_quality": self.reduced_quality,
+            "average_work_time": sum(work_times) / len(work_times),
+            "max_work_time": max(work_times),
+        }
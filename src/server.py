@@ -0,0 +1,221 @@
+import argparse
+import asyncio
+import time
+import pygame
+
+from . import constants, game_objects, levels, protocol, sprite_groups
+from .controls import Action, Controls
+from .game import Game
+
+
+class Client:
+
+    def __init__(self, writer, session, driver):
+        self.writer = writer
+        self.session = session
+        self.driver = driver
+        self.acked_tick = 0
+        self.bytes_sent = 0
+        self.connected_at = time.perf_counter()
+
+    @property
+    def bandwidth(self):
+        return self.bytes_sent / max(time.perf_counter() - self.connected_at, 1e-9)
+
+    def send(self, data):
+        self.writer.write(data)
+        self.bytes_sent += len(data)
+
+
+class Session:
+
+    def __init__(self, index, size):
+        self.index = index
+        self.world = sprite_groups.World()
+        self.tick = 0
+        self.history = {}
+        self.clients = []
+        self.controls = Controls()
+        self.jump_presses = 0
+
+        with self.world:
+            self.game = Game(pygame.Surface(size))
+            self.game.add_level(levels.FirstLevel(self.game))
+            self.game.add_level(levels.SecondLevel(self.game))
+            self.game.next_level()
+
+    def snapshot(self):
+        state = {}
+        sprites = list(self.game.current_level)
+
+        if self.game.player.alive:
+            sprites.append(self.game.player)
+
+        for sprite in sprites:
+            health = int(sprite.health) if isinstance(sprite, game_objects.Character) else 0
+            state[sprite.object_id] = (
+                game_objects.TYPE_IDS[type(sprite)], sprite.rect.x, sprite.rect.y, health, sprite.frame_id
+            )
+
+        return state
+
+    def receive_input(self, mask, jump_presses):
+        # A press is stamped when its packet arrives and then buffered for the grace time like local input
+        self.controls.held = protocol.mask_actions(mask)
+
+        if protocol.new_presses(jump_presses, self.jump_presses):
+            self.controls.press(Action.jump)
+
+        self.jump_presses = jump_presses
+
+    def apply_input(self):
+        self.controls.apply(self.game.player)
+        # Nothing is presented on the server, so the applied presses have no latency to measure
+        self.controls.take_applied()
+
+    def step(self):
+        with self.world:
+            if not self.game.player.alive:
+                self.game.start_level()
+
+            self.apply_input()
+            self.game.update()
+            state = self.snapshot()
+
+        self.tick += 1
+        self.history[self.tick] = state
+        self.history.pop(self.tick - constants.STATE_HISTORY_TICKS, None)
+
+    def broadcast(self):
+        state = self.history[self.tick]
+
+        for client in self.clients:
+            if client.writer.transport.get_write_buffer_size() > constants.MAX_CLIENT_WRITE_BUFFER:
+                continue
+
+            base_tick = client.acked_tick if client.acked_tick in self.history else 0
+            client.send(protocol.encode_state(self.tick, base_tick, self.history.get(base_tick, {}), state))
+
+
+class Server:
+
+    def __init__(self, sessions=1, tick_rate=constants.GAME_FPS, size=constants.WORLD_SIZE):
+        self.sessions = [Session(index, size) for index in range(sessions)]
+        self.tick_rate = tick_rate
+        self.size = size
+        self.ticks = 0
+        self.started_at = None
+
+    @property
+    def clients(self):
+        return [client for session in self.sessions for client in session.clients]
+
+    @property
+    def stats(self):
+        elapsed = time.perf_counter() - self.started_at if self.started_at is not None else 0
+        clients = self.clients
+
+        return {
+            "sessions": len(self.sessions),
+            "clients": len(clients),
+            "ticks": self.ticks,
+            "ticks_per_second": self.ticks / elapsed if elapsed else 0,
+            "bytes_per_client_per_second": sum(c.bandwidth for c in clients) / len(clients) if clients else 0,
+        }
+
+    async def handle_client(self, reader, writer):
+        buffer = bytearray()
+        client = None
+
+        try:
+            while True:
+                data = await reader.read(4096)
+
+                if not data:
+                    break
+
+                buffer.extend(data)
+
+                for message_type, body in protocol.read_messages(buffer):
+                    body_struct = protocol.CLIENT_BODIES.get(message_type)
+
+                    # A short or garbled body would make unpack raise, such a client is dropped
+                    if body_struct is None or len(body) != body_struct.size:
+                        return
+
+                    if message_type == protocol.JOIN and client is None:
+                        index, driver = protocol.JOIN_BODY.unpack(body)
+                        session = self.sessions[index % len(self.sessions)]
+                        client = Client(writer, session, bool(driver))
+                        session.clients.append(client)
+                        client.send(protocol.message(
+                            protocol.WELCOME, protocol.WELCOME_BODY.pack(session.index, *self.size)))
+                    elif message_type == protocol.ACK and client is not None:
+                        client.acked_tick = max(client.acked_tick, *protocol.ACK_BODY.unpack(body))
+                    elif message_type == protocol.INPUT and client is not None and client.driver:
+                        client.session.receive_input(*protocol.INPUT_BODY.unpack(body))
+        except ConnectionError:
+            pass
+        finally:
+            if client is not None:
+                client.session.clients.remove(client)
+
+            writer.close()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate if self.tick_rate else 0
+        next_tick = loop.time()
+        self.started_at = time.perf_counter()
+
+        while True:
+            for session in self.sessions:
+                session.step()
+                session.broadcast()
+
+            self.ticks += 1
+            next_tick += interval
+            delay = next_tick - loop.time()
+
+            if delay < 0:
+                next_tick = loop.time()
+                delay = 0
+
+            await asyncio.sleep(delay)
+
+    async def serve(self, host=constants.SERVER_HOST, port=constants.SERVER_PORT, stats_interval=None):
+        server = await asyncio.start_server(self.handle_client, host, port)
+
+        async with server:
+            tasks = [asyncio.create_task(self.run())]
+
+            if stats_interval:
+                tasks.append(asyncio.create_task(self.report_stats(stats_interval)))
+
+            await asyncio.gather(*tasks)
+
+    async def report_stats(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            print(self.stats, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.server")
+    parser.add_argument("--host", default=constants.SERVER_HOST)
+    parser.add_argument("--port", type=int, default=constants.SERVER_PORT)
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--tick-rate", type=int, default=constants.GAME_FPS, help="0 runs ticks back to back")
+    parser.add_argument("--stats-interval", type=float, default=5, help="seconds between stats lines, 0 to disable")
+    args = parser.parse_args()
+
+    server = Server(args.sessions, args.tick_rate)
+
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.stats_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
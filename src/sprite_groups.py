@@ -1,7 +1,114 @@
+import weakref
 import pygame
 
+from . import constants
+
+
+class SolidGroup(pygame.sprite.Group):
+
+    # Broad phase for sweeps. Sprites with STATIC set never move once placed, so they are
+    # bucketed by the grid cells they cover; the few moving solids are checked one by one.
+    # A static sprite is placed on the first query after it joins, when the level has already
+    # put it in position, and keeps its cells when a World moves it out and back in
+
+    def __init__(self, *sprites, cell_size=constants.TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.placed = weakref.WeakKeyDictionary()
+        self.unplaced = {}
+        self.moving = {}
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+
+        if not getattr(sprite, "STATIC", False):
+            self.moving[sprite] = None
+        elif sprite in self.placed:
+            self._bucket(sprite)
+        else:
+            self.unplaced[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.unplaced.pop(sprite, None)
+        self.moving.pop(sprite, None)
+
+        for cell in self.placed.get(sprite, ()):
+            self.cells[cell].pop(sprite, None)
+
+    def _bucket(self, sprite):
+        cells = self.cells
+
+        for cell in self.placed[sprite]:
+            bucket = cells.get(cell)
+
+            if bucket is None:
+                bucket = cells[cell] = {}
+
+            bucket[sprite] = None
+
+    def covered_cells(self, rect):
+        size = self.cell_size
+        return [
+            (x, y)
+            for x in range(rect.left // size, (rect.right - 1) // size + 1)
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1)
+        ]
+
+    def query(self, rect):
+        # Solids whose rect overlaps rect
+        for sprite in self.unplaced:
+            self.placed[sprite] = self.covered_cells(sprite.rect)
+            self._bucket(sprite)
+
+        self.unplaced.clear()
+        found = dict(self.moving)
+        cells = self.cells
+
+        for cell in self.covered_cells(rect):
+            bucket = cells.get(cell)
+
+            if bucket:
+                found.update(bucket)
+
+        return [sprite for sprite in found if rect.colliderect(sprite.rect)]
+
+
 X_BORDERS = pygame.sprite.Group()
 Y_BORDERS = pygame.sprite.Group()
 CHARACTERS = pygame.sprite.Group()
 PLAYERS = pygame.sprite.Group()
-SOLID = pygame.sprite.Group()
+SOLID = SolidGroup()
+
+ALL = (X_BORDERS, Y_BORDERS, CHARACTERS, PLAYERS, SOLID)
+
+
+class World:
+
+    # Separate contents of the global groups, so several games can live in one process.
+    # Everything that creates or updates a game's sprites must run inside its world.
+    # Outside of it the sprites wait in the world's own groups, so kill() and remove()
+    # keep working there, they just find no global groups to leave
+
+    def __init__(self):
+        self.contents = [pygame.sprite.Group() for _ in ALL]
+        self._saved = None
+
+    @staticmethod
+    def _move(source, target):
+        for group, holder in zip(source, target):
+            sprites = group.sprites()
+            group.empty()
+            holder.add(sprites)
+
+    def __enter__(self):
+        self._saved = [pygame.sprite.Group() for _ in ALL]
+        self._move(ALL, self._saved)
+        self._move(self.contents, ALL)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._move(ALL, self.contents)
+        self._move(self._saved, ALL)
+        self._saved = None
@@ -0,0 +1,154 @@
+import argparse
+import mmap
+import struct
+import time
+import pygame
+
+from pathlib import Path
+
+from . import constants, game_objects
+
+MAGIC = b"EGTL"
+VERSION = 1
+
+# magic, version, record size, capacity, records written
+HEADER = struct.Struct("<4sIIIQ")
+
+OBJECT_RECORD = 1
+FRAME_RECORD = 2
+
+# kind, type id, contacts, tick, time, object id, x, y, width, height, speed x, speed y, health
+OBJECT = struct.Struct("<BBBxIdIhhhhfff")
+# kind, tick, time, events, update, draw, flip (ms)
+FRAME = struct.Struct("<BxxxIdffff8x")
+RECORD_SIZE = OBJECT.size
+
+FRAME_PHASES = ("events", "update", "draw", "flip")
+
+assert FRAME.size == RECORD_SIZE
+
+
+class TelemetryRecorder:
+
+    # Fixed-size ring of binary records in an mmap'd file. Records are packed straight
+    # into the mapping, so the per-tick path creates no intermediate buffers
+
+    def __init__(self, path, capacity=constants.TELEMETRY_CAPACITY):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.written = 0
+        size = HEADER.size + capacity * RECORD_SIZE
+
+        with self.path.open("w+b") as file:
+            file.truncate(size)
+            self.buffer = mmap.mmap(file.fileno(), size)
+
+        self._write_header()
+
+    def _write_header(self):
+        HEADER.pack_into(self.buffer, 0, MAGIC, VERSION, RECORD_SIZE, self.capacity, self.written)
+
+    def _next_offset(self):
+        offset = HEADER.size + (self.written % self.capacity) * RECORD_SIZE
+        self.written += 1
+        return offset
+
+    def record_tick(self, tick, sprites, timings):
+        now = time.monotonic()
+        buffer = self.buffer
+        pack_object = OBJECT.pack_into
+        type_ids = game_objects.TYPE_IDS
+        # Sprite.alive is shadowed by the health based property of characters, killed sprites are in no groups
+        in_groups = pygame.sprite.Sprite.alive
+
+        for sprite in sprites:
+            if not in_groups(sprite):
+                continue
+
+            rect = sprite.rect
+            pack_object(
+                buffer, self._next_offset(), OBJECT_RECORD, type_ids.get(type(sprite), 255), sprite.contacts,
+                tick, now, sprite.object_id, rect.x, rect.y, rect.width, rect.height,
+                sprite.speed.x, sprite.speed.y, getattr(sprite, "health", 0)
+            )
+
+        FRAME.pack_into(buffer, self._next_offset(), FRAME_RECORD, tick, now, *timings)
+        self._write_header()
+
+    def close(self):
+        self.buffer.close()
+
+
+def read_records(path):
+    data = Path(path).read_bytes()
+    magic, version, record_size, capacity, written = HEADER.unpack_from(data)
+
+    if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError(f"{path} is not a telemetry file of version {VERSION}")
+
+    first = max(0, written - capacity)
+
+    for index in range(first, written):
+        offset = HEADER.size + (index % capacity) * RECORD_SIZE
+        kind = data[offset]
+
+        if kind == OBJECT_RECORD:
+            yield OBJECT.unpack_from(data, offset)
+        elif kind == FRAME_RECORD:
+            yield FRAME.unpack_from(data, offset)
+
+
+def record_time(record):
+    return record[2] if record[0] == FRAME_RECORD else record[4]
+
+
+def format_record(record, type_names):
+    if record[0] == FRAME_RECORD:
+        _, tick, timestamp, *timings = record
+        phases = " ".join(f"{name}={value:.2f}ms" for name, value in zip(FRAME_PHASES, timings))
+        return f"{timestamp:.3f} tick={tick} frame {phases}"
+
+    _, type_id, contacts, tick, timestamp, object_id, x, y, width, height, speed_x, speed_y, health = record
+    type_name = type_names[type_id] if type_id < len(type_names) else "?"
+    return (
+        f"{timestamp:.3f} tick={tick} {type_name}#{object_id} rect=({x}, {y}, {width}, {height}) "
+        f"speed=({speed_x:.1f}, {speed_y:.1f}) health={health:.1f} contacts={contacts:04b}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m src.telemetry", description="dump a telemetry ring buffer")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--seconds", type=float, help="only the last N seconds before the newest record")
+    parser.add_argument("--object", type=int, action="append", help="only these object ids")
+    parser.add_argument("--type", action="append", help="only these object types, e.g. Player")
+    parser.add_argument("--frames", action="store_true", help="only frame timing records")
+    parser.add_argument("--no-frames", action="store_true", help="skip frame timing records")
+    args = parser.parse_args()
+
+    type_names = [object_type.__name__ for object_type in game_objects.OBJECT_TYPES]
+    records = list(read_records(args.path))
+
+    if args.seconds is not None and records:
+        since = max(record_time(record) for record in records) - args.seconds
+        records = [record for record in records if record_time(record) >= since]
+
+    for record in records:
+        if record[0] == FRAME_RECORD:
+            if args.no_frames or args.object or args.type:
+                continue
+        else:
+            if args.frames:
+                continue
+
+            if args.object and record[5] not in args.object:
+                continue
+
+            if args.type and (record[1] >= len(type_names) or type_names[record[1]] not in args.type):
+                continue
+
+        print(format_record(record, type_names))
+
+
+if __name__ == "__main__":
+    main()
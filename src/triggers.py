@@ -0,0 +1,28 @@
+class TriggerZone:
+
+    # Static rectangle that reports actors entering, staying in and leaving it.
+    # Callbacks get the actor; enter fires on the first overlapping tick, stay on the following ones
+
+    def __init__(self, rect, on_enter=None, on_stay=None, on_exit=None):
+        self.rect = rect.copy()
+        self.on_enter = on_enter
+        self.on_stay = on_stay
+        self.on_exit = on_exit
+        self.inside = []
+
+    def events(self, actors, rects):
+        # Lists rather than sets keep the callback order the same as the actors order
+        inside = [actors[index] for index in self.rect.collidelistall(rects)]
+        events = []
+
+        if self.on_exit is not None:
+            events.extend((self.on_exit, actor) for actor in self.inside if actor not in inside)
+
+        for actor in inside:
+            callback = self.on_stay if actor in self.inside else self.on_enter
+
+            if callback is not None:
+                events.append((callback, actor))
+
+        self.inside = inside
+        return events
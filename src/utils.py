@@ -1,13 +1,57 @@
 import pygame
 
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from . import constants
 
+# Re-exported for the rest of the package, which imports it from here
+try:
+    from functools import cached_property  # noqa: F401 pylint: disable=unused-import
+except ImportError:  # Python < 3.8
+    from cached_property import cached_property  # noqa: F401 pylint: disable=unused-import
+
 ASSETS_PATH = Path(__file__).parent / "../assets"
 
 
+class LRUCache:
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        try:
+            self._items.move_to_end(key)
+        except KeyError:
+            return default
+
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        self._items.clear()
+
+
 def load_image_from_path(path):
-    return pygame.image.load(str(path.resolve()))
+    return _load_image(str(path.resolve()))
+
+
+@lru_cache(maxsize=None)
+def _load_image(path):
+    return pygame.image.load(path)
 
 
 def load_image(filename):
@@ -15,6 +59,10 @@ def load_image(filename):
     return load_image_from_path(asset_path)
 
 
+def load_font(filename, size):
+    return pygame.font.Font(str((ASSETS_PATH / "fonts" / filename).resolve()), size)
+
+
 def find(predicate, seq):
     for item in seq:
         if predicate(seq):
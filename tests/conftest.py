@@ -0,0 +1,35 @@
+import os
+import sys
+
+from pathlib import Path
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pygame  # noqa: E402
+import pytest  # noqa: E402
+
+from src import constants, levels, sprite_groups  # noqa: E402
+from src.game import Game  # noqa: E402
+
+
+@pytest.fixture
+def make_game():
+    # Builds a game on both levels, in whatever World is active at the call
+    def make():
+        game = Game(pygame.Surface(constants.WORLD_SIZE))
+        game.add_level(levels.FirstLevel(game))
+        game.add_level(levels.SecondLevel(game))
+        game.next_level()
+        return game
+
+    pygame.display.init()
+    return make
+
+
+@pytest.fixture
+def game(make_game):
+    yield make_game()
+
+    for group in sprite_groups.ALL:
+        group.empty()
@@ -0,0 +1,107 @@
+import pygame
+import pytest
+
+from src import constants, game_objects, sprite_groups
+
+
+def ground_top(level, x):
+    column = x // constants.TILE_SIZE
+    row = next(y for y, tiles in enumerate(level.tiles) if tiles[column].solid)
+    return row * constants.TILE_SIZE
+
+
+def brick_at(x, y):
+    brick = game_objects.Brick()
+    brick.rect.topleft = (x, y)
+    return brick
+
+
+def step(player, speed_x, speed_y=0):
+    player.speed.x = speed_x
+    player.speed.y = speed_y
+    player.update()
+
+
+@pytest.mark.parametrize("speed", [300, 500, 2000])
+def test_fast_push_left_stops_at_border(game, speed):
+    player = game.player
+    player.rect.x = 100
+    step(player, -speed)
+
+    assert player.rect.left == game.left_border.rect.right == 1
+
+
+@pytest.mark.parametrize("speed", [300, 500, 2000])
+def test_fast_push_right_stops_at_border(game, speed):
+    player = game.player
+    player.rect.right = game.width - 100
+    step(player, speed)
+
+    assert player.rect.right == game.right_border.rect.left == game.width
+
+
+def test_fast_fall_lands_on_ground(game):
+    player = game.player
+    player.rect.topleft = (40, 10)
+    step(player, 0, 2000)
+
+    assert player.rect.bottom == ground_top(game.current_level, player.rect.centerx)
+
+
+def test_fall_starting_inside_border_is_not_pulled_back(game):
+    player = game.player
+    player.rect.topleft = (40, 0)
+    assert player.rect.colliderect(game.up_border.rect)
+    step(player, 0, 2000)
+
+    assert player.rect.bottom == ground_top(game.current_level, player.rect.centerx)
+
+
+def test_push_starting_inside_border_moves_away(game):
+    player = game.player
+    player.rect.x = 0
+    assert player.rect.colliderect(game.left_border.rect)
+    step(player, 300)
+
+    assert player.rect.x == 300
+
+
+def test_walk_along_ground_is_not_blocked_by_it(game):
+    player = game.player
+    player.rect.bottomleft = (400, game.height - constants.TILE_SIZE)
+    step(player, 5)
+
+    assert player.rect.x == 405
+    assert player.rect.bottom == game.height - constants.TILE_SIZE
+
+
+def test_diagonal_move_does_not_cut_a_corner(game):
+    # Both axes reach the brick at the same time; moving x then y used to pass straight through
+    player = game.player
+    player.rect.topleft = (700, 100)
+    brick = brick_at(760, 160)
+    step(player, 100, 100)
+
+    assert not player.rect.colliderect(brick.rect)
+    assert player.rect.bottom == brick.rect.top
+    assert player.rect.x == 800
+
+
+def test_diagonal_move_slides_along_a_wall(game):
+    player = game.player
+    player.rect.topleft = (700, 100)
+    brick = brick_at(760, 120)
+    step(player, 100, 100)
+
+    assert player.rect.right == brick.rect.left
+    assert player.rect.y == 200
+
+
+def test_query_finds_only_nearby_solids(game):
+    brick = brick_at(760, 160)
+    near = sprite_groups.SOLID.query(pygame.Rect(740, 140, 30, 30))
+
+    assert near == [brick]
+
+    brick.kill()
+    assert brick not in sprite_groups.SOLID.query(pygame.Rect(740, 140, 30, 30))
@@ -0,0 +1,69 @@
+import pygame
+
+from src import constants
+from src.controls import Action, Controls
+
+
+def press_jump(controls, timestamp):
+    controls.process_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE), timestamp)
+
+
+def lift(player):
+    player.rect.y -= 2 * constants.TILE_SIZE
+    player.update()
+    assert player.speed.y > 0
+
+
+def land(player):
+    for _ in range(60):
+        player.update()
+
+        if player.speed.y == 0:
+            return
+
+    raise AssertionError("player did not land")
+
+
+def test_jump_pressed_in_the_air_fires_on_landing(game):
+    player = game.player
+    controls = Controls()
+    lift(player)
+    press_jump(controls, 0)
+    controls.apply(player, 10)
+    assert not player.is_jumping
+
+    land(player)
+    controls.apply(player, constants.INPUT_GRACE_TIME)
+
+    assert player.is_jumping
+    assert controls.take_applied() == [(Action.jump, 0)]
+
+
+def test_jump_is_dropped_after_the_grace_time(game):
+    player = game.player
+    controls = Controls()
+    lift(player)
+    press_jump(controls, 0)
+    controls.apply(player, 10)
+    land(player)
+    controls.apply(player, constants.INPUT_GRACE_TIME + 1)
+
+    assert not player.is_jumping
+    assert Action.jump not in controls.pressed
+    assert controls.take_applied() == []
+
+
+def test_press_is_consumed_once(game):
+    player = game.player
+    controls = Controls()
+    press_jump(controls, 0)
+    controls.apply(player, 1)
+    assert player.is_jumping
+
+    player.is_jumping = False
+    player.speed.y = 0
+    controls.apply(player, 2)
+
+    assert not player.is_jumping
+    assert controls.take_applied() == [(Action.jump, 0)]
+    assert controls.take_applied() == []
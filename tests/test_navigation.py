@@ -0,0 +1,72 @@
+import pygame
+import pytest
+
+from src import constants, game_objects
+from src.navigation import EdgeKind
+
+
+def standing_rect(x, y):
+    # A tile-sized body standing in tile (x, y)
+    return pygame.Rect(x * constants.TILE_SIZE, y * constants.TILE_SIZE, constants.TILE_SIZE, constants.TILE_SIZE)
+
+
+@pytest.fixture
+def graph(game):
+    game.next_level()
+    return game.current_level.navigation(game_objects.EnemyFrog)
+
+
+def span_at(graph, y, x):
+    return next(span for span in graph.spans if span.y == y and span.left <= x <= span.right)
+
+
+def test_spans_follow_second_level_floors(graph):
+    assert [(span.y, span.left, span.right) for span in graph.spans] == [
+        (3, 10, 19),
+        (8, 0, 8), (8, 21, 29),
+        (13, 0, 9), (13, 20, 29),
+        (18, 0, 29),
+    ]
+
+
+def test_falls_lead_off_span_ends(graph):
+    top = span_at(graph, 3, 15)
+    falls = sorted((edge.takeoff_x, edge.landing_x, edge.target.y) for edge in top.edges if edge.kind == EdgeKind.fall)
+
+    assert falls == [(10, 9, 13), (19, 20, 13)]
+
+
+def test_jump_links_lower_and_upper_tier(graph):
+    ground = span_at(graph, 18, 15)
+    jumps = {edge.target: edge for edge in ground.edges if edge.kind == EdgeKind.jump}
+
+    assert set(jumps) == {span_at(graph, 13, 0), span_at(graph, 13, 29)}
+
+    edge = jumps[span_at(graph, 13, 0)]
+    assert (edge.takeoff_x, edge.landing_x) == (10, 9)
+    assert edge.jump_tiles == game_objects.EnemyFrog.JUMP_TILES
+
+
+def test_next_edge_leads_to_upper_tier(graph):
+    rect = standing_rect(15, 18)
+    target_rect = standing_rect(15, 3)
+    edge = graph.next_edge(rect, target_rect)
+
+    assert edge.kind == EdgeKind.jump
+    assert edge.source is span_at(graph, 18, 15)
+
+    path = graph.path(edge.source, span_at(graph, 3, 15))
+    assert path[0] is edge
+    assert path[-1].target is span_at(graph, 3, 15)
+    assert all(step.target is following.source for step, following in zip(path, path[1:]))
+    assert [step.target.y for step in path] == [13, 8, 3]
+
+
+def test_paths_are_cached(graph):
+    start, goal = span_at(graph, 18, 15), span_at(graph, 3, 15)
+
+    assert graph.path(start, goal) is graph.path(start, goal)
+
+
+def test_no_edge_needed_within_a_span(graph):
+    assert graph.next_edge(standing_rect(15, 18), standing_rect(2, 18)) is None
@@ -0,0 +1,74 @@
+from src import constants, protocol
+
+
+FIRST = {
+    1: (0, 40, 720, 100, 0),
+    2: (3, 200, 680, 0, 0),
+    3: (5, 960, 280, 50, 7),
+}
+
+
+def state_body(tick, base_tick, base, state):
+    (message_type, body), = protocol.read_messages(bytearray(protocol.encode_state(tick, base_tick, base, state)))
+    assert message_type == protocol.STATE
+    return body
+
+
+def test_full_round_trip():
+    assert protocol.decode_state(state_body(1, 0, {}, FIRST), {}) == (1, FIRST)
+
+
+def test_delta_round_trip_sends_only_changes():
+    second = dict(FIRST)
+    second[1] = (0, 45, 720, 100, 1)
+    full = state_body(2, 0, {}, second)
+    delta = state_body(2, 1, FIRST, second)
+
+    assert protocol.decode_state(delta, FIRST) == (2, second)
+    assert len(delta) < len(full)
+    assert protocol.decode_state(state_body(3, 2, second, second), second) == (3, second)
+
+
+def test_added_and_removed_objects():
+    second = {object_id: values for object_id, values in FIRST.items() if object_id != 2}
+    second[4] = (1, 300, 300, 0, 2)
+
+    assert protocol.decode_state(state_body(2, 1, FIRST, second), FIRST) == (2, second)
+
+
+def test_buffer_applies_deltas_against_acked_ticks():
+    states = protocol.StateBuffer()
+    second = {**FIRST, 1: (0, 45, 720, 100, 1)}
+
+    assert states.apply(state_body(1, 0, {}, FIRST)) == 1
+    assert states.apply(state_body(2, 1, FIRST, second)) == 2
+    assert states.state == second
+
+
+def test_buffer_skips_missing_base():
+    states = protocol.StateBuffer()
+    states.apply(state_body(1, 0, {}, FIRST))
+
+    assert states.apply(state_body(3, 2, FIRST, {})) is None
+    assert states.tick == 1
+    assert states.state == FIRST
+
+
+def test_buffer_skips_stale_ticks():
+    states = protocol.StateBuffer()
+    states.apply(state_body(2, 0, {}, FIRST))
+
+    assert states.apply(state_body(1, 0, {}, {})) is None
+    assert states.apply(state_body(2, 0, {}, {})) is None
+    assert states.state == FIRST
+
+
+def test_buffer_forgets_old_bases():
+    states = protocol.StateBuffer()
+    states.apply(state_body(1, 0, {}, FIRST))
+    last = 1 + constants.STATE_HISTORY_TICKS
+    states.apply(state_body(last, 0, {}, FIRST))
+
+    assert 1 not in states.states
+    assert states.apply(state_body(last + 1, 1, FIRST, FIRST)) is None
+    assert states.apply(state_body(last + 1, 0, {}, FIRST)) == last + 1
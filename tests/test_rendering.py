@@ -0,0 +1,47 @@
+import pygame
+import pytest
+
+from src import constants
+from src.rendering import RenderLayer, RenderQueue, RenderSnapshot, RenderTarget
+
+
+def tiled_snapshot():
+    tile = pygame.Surface((constants.TILE_SIZE, constants.TILE_SIZE))
+    tile.fill((255, 255, 255))
+    queue = RenderQueue()
+    width, height = constants.WORLD_SIZE
+
+    for x in range(0, width, constants.TILE_SIZE):
+        for y in range(0, height, constants.TILE_SIZE):
+            queue.add(RenderLayer.background, tile, (x, y))
+
+    return RenderSnapshot(0, (0, 0, 0), queue)
+
+
+@pytest.mark.parametrize("scale", [1, 0.66, 0.5, 0.33])
+def test_scaled_tiles_leave_no_seams(scale):
+    render_target = RenderTarget(pygame.Surface(constants.WORLD_SIZE), constants.WORLD_SIZE, scale)
+    render_target.render(tiled_snapshot())
+
+    black = pygame.mask.from_threshold(render_target.surface, (0, 0, 0), (1, 1, 1, 255))
+    assert black.count() == 0
+
+
+@pytest.mark.parametrize("scale", [1, 0.66])
+def test_restored_frame_matches_full_redraw(scale):
+    static = tiled_snapshot()
+    sprite = pygame.Surface((30, 30))
+    sprite.fill((255, 0, 0))
+    targets = [
+        RenderTarget(pygame.Surface(constants.WORLD_SIZE), constants.WORLD_SIZE, scale) for _ in range(2)
+    ]
+
+    for x in (100, 130, 400):
+        queue = RenderQueue()
+        queue.set_static(RenderLayer.background, static.layers[RenderLayer.background.value])
+        queue.add(RenderLayer.player, sprite, (x, 200))
+        targets[0].render(RenderSnapshot(0, (0, 0, 0), queue))
+
+    targets[1].render(RenderSnapshot(0, (0, 0, 0), queue))
+    restored, redrawn = (target.surface for target in targets)
+    assert pygame.image.tostring(restored, "RGB") == pygame.image.tostring(redrawn, "RGB")
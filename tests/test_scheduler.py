@@ -0,0 +1,40 @@
+import threading
+import time
+
+import pygame
+
+from src.scheduler import FrameScheduler
+
+
+def test_events_are_stamped_while_waiting():
+    pygame.display.init()
+    pygame.event.clear()
+    scheduler = FrameScheduler(20)
+    scheduler.tick()
+    posted = []
+    stamped = []
+
+    def post():
+        posted.append(time.perf_counter() * 1000)
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+
+    timer = threading.Timer(0.02, post)
+    timer.start()
+    scheduler.tick(lambda event, timestamp: stamped.append((event.type, timestamp)))
+    timer.join()
+
+    assert [event_type for event_type, _ in stamped] == [pygame.KEYDOWN]
+    assert 0 <= stamped[0][1] - posted[0] < 5
+
+
+def test_events_queued_during_work_get_the_previous_pump_time():
+    pygame.display.init()
+    pygame.event.clear()
+    scheduler = FrameScheduler(None)
+    scheduler.tick(lambda event, timestamp: None)
+    pumped_at = scheduler.pumped_at
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    stamped = []
+    scheduler.tick(lambda event, timestamp: stamped.append(timestamp))
+
+    assert stamped == [pumped_at]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from src import constants, protocol
+from src.server import Server, Session
+
+
+@pytest.fixture
+def session():
+    return Session(0, constants.WORLD_SIZE)
+
+
+def test_tap_inside_one_frame_jumps(session):
+    # Down and up before the client's next frame: the held mask never has the jump bit
+    session.receive_input(0, 1)
+    session.step()
+
+    assert session.game.player.is_jumping
+
+
+def test_press_is_taken_once(session):
+    player = session.game.player
+    session.receive_input(0, 1)
+    session.step()
+    player.is_jumping = False
+    player.speed.y = 0
+    session.receive_input(0, 1)
+    session.step()
+
+    assert not player.is_jumping
+
+
+def test_press_while_falling_jumps_on_landing(session):
+    player = session.game.player
+    player.rect.y -= 2 * constants.TILE_SIZE
+    session.step()
+    assert player.speed.y > 0
+
+    session.receive_input(0, 1)
+    session.step()
+    assert not player.is_jumping
+
+    for _ in range(30):
+        session.step()
+
+        if player.is_jumping:
+            break
+
+    assert player.is_jumping
+
+
+def test_press_counter_wraps(session):
+    session.jump_presses = 0xFFFF
+    session.receive_input(0, 0)
+    session.step()
+
+    assert session.game.player.is_jumping
+
+
+def test_garbled_message_drops_the_client():
+    errors = []
+
+    async def exchange():
+        # A handler that raises only shows up through the loop's exception handler
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: errors.append(context))
+        server = Server()
+        tcp_server = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+        port = tcp_server.sockets[0].getsockname()[1]
+
+        async with tcp_server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(protocol.message(protocol.JOIN, b"\x00"))
+            await writer.drain()
+            data = await asyncio.wait_for(reader.read(), 5)
+            writer.close()
+            await asyncio.sleep(0.05)
+            return data, server.clients
+
+    data, clients = asyncio.run(exchange())
+    assert data == b""
+    assert clients == []
+    assert errors == []
@@ -0,0 +1,27 @@
+from src import telemetry
+
+
+def recorded_ids(path):
+    return [record[5] for record in telemetry.read_records(path) if record[0] == telemetry.OBJECT_RECORD]
+
+
+def test_tracked_follows_level_lifetime(game):
+    level = game.current_level
+    assert level.tracked == level.dynamic_objects + [game.player]
+
+    level.kill()
+    assert level.tracked == []
+
+
+def test_killed_sprites_are_not_recorded(game, tmp_path):
+    path = tmp_path / "telemetry.bin"
+    recorder = telemetry.TelemetryRecorder(path, capacity=64)
+    level = game.current_level
+    killed = level.dynamic_objects[0]
+    killed.kill()
+    recorder.record_tick(1, level.tracked, (0, 0, 0, 0))
+    recorder.close()
+
+    ids = recorded_ids(path)
+    assert killed.object_id not in ids
+    assert ids == [sprite.object_id for sprite in level.tracked if sprite is not killed]
@@ -0,0 +1,85 @@
+import pygame
+
+from src import constants, game_objects
+from src.triggers import TriggerZone
+
+
+class Actor:
+
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 10, 10)
+        self.alive = True
+
+
+def recording_zone(rect, calls):
+    return TriggerZone(
+        rect,
+        on_enter=lambda actor: calls.append(("enter", actor)),
+        on_stay=lambda actor: calls.append(("stay", actor)),
+        on_exit=lambda actor: calls.append(("exit", actor)),
+    )
+
+
+def run(zone, actors):
+    for callback, actor in zone.events(actors, [actor.rect for actor in actors]):
+        callback(actor)
+
+
+def test_enter_stay_exit():
+    calls = []
+    zone = recording_zone(pygame.Rect(0, 0, 50, 50), calls)
+    actor = Actor(100, 100)
+
+    run(zone, [actor])
+    assert calls == []
+
+    actor.rect.topleft = (20, 20)
+    run(zone, [actor])
+    run(zone, [actor])
+    actor.rect.topleft = (100, 100)
+    run(zone, [actor])
+    run(zone, [actor])
+
+    assert calls == [("enter", actor), ("stay", actor), ("exit", actor)]
+
+
+def test_dead_actors_are_skipped(game):
+    level = game.current_level
+    calls = []
+    level.add_trigger(recording_zone(game.player.rect, calls))
+    game.player.health = 0
+    level.update_triggers()
+
+    assert calls == []
+
+
+def test_level_switch_drops_stale_callbacks(game):
+    level = game.current_level
+    pointer = next(sprite for sprite in level.dynamic_objects if isinstance(sprite, game_objects.LevelPointer))
+    calls = []
+    level.add_trigger(recording_zone(pointer.rect, calls))
+    game.player.rect.center = pointer.rect.center
+    level.update_triggers()
+
+    assert game.current_level is not level
+    assert calls == []
+
+
+def first_solid_row(level, rect):
+    columns = range(rect.left // constants.TILE_SIZE, (rect.right - 1) // constants.TILE_SIZE + 1)
+    return next(
+        y for y in range(rect.top // constants.TILE_SIZE + 1, level.y_tiles)
+        if any(level.tiles[y][x].solid for x in columns)
+    )
+
+
+def test_trigger_objects_are_settled_on_the_ground(game):
+    for _ in range(2):
+        level = game.current_level
+        triggers = [sprite for sprite in level.dynamic_objects if isinstance(sprite, game_objects.TriggerObject)]
+        assert triggers
+
+        for sprite in triggers:
+            assert sprite.rect.bottom == first_solid_row(level, sprite.rect) * constants.TILE_SIZE
+
+        game.next_level()
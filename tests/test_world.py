@@ -0,0 +1,36 @@
+from src import sprite_groups
+
+
+def test_worlds_keep_their_own_sprites(game, make_game):
+    outside = [group.sprites() for group in sprite_groups.ALL]
+    first, second = sprite_groups.World(), sprite_groups.World()
+
+    with first:
+        first_game = make_game()
+
+    with second:
+        second_game = make_game()
+        assert second_game.player in sprite_groups.PLAYERS
+        assert first_game.player not in sprite_groups.PLAYERS
+
+    assert [group.sprites() for group in sprite_groups.ALL] == outside
+
+    with first:
+        assert sprite_groups.PLAYERS.sprites() == [first_game.player]
+        assert first_game.left_border in sprite_groups.SOLID
+
+
+def test_kill_outside_world(game, make_game):
+    world = sprite_groups.World()
+
+    with world:
+        world_game = make_game()
+
+    world_game.player.kill()
+    world_game.current_level.kill()
+    assert game.player in sprite_groups.PLAYERS
+
+    with world:
+        assert world_game.player not in sprite_groups.PLAYERS
+        assert world_game.player not in sprite_groups.SOLID
+        assert world_game.left_border in sprite_groups.SOLID